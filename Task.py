@@ -1,3 +1,4 @@
+import sys
 from enum import Enum
 
 class TaskStatus(Enum):
@@ -6,17 +7,27 @@ class TaskStatus(Enum):
     COMPLETED = "Completed"
     OVERDUE = "Overdue"
 
+# Прогресс выполнения - целое число от 0 до 100 (True/False числом не считаются).
+def is_valid_progress(progress):
+    return isinstance(progress, int) and not isinstance(progress, bool) and 0 <= progress <= 100
+
+# __slots__ вместо __dict__ у каждого экземпляра: при миллионах задач это основная
+# часть занимаемой памяти. Имена исполнителей и сроки интернируются, чтобы задачи
+# с одинаковыми значениями ссылались на одну строку.
 class Task:
+    __slots__ = ('id', 'title', 'description', 'status', 'due_date', 'assignee', 'progress')
     _id_counter = 1
 
-    def __init__(self, title, description, status, due_date, assignee=None, progress=0):
-        self.id = Task._id_counter
-        Task._id_counter += 1
+    def __init__(self, title, description, status, due_date, assignee=None, progress=0, task_id=None):
+        if task_id is None:
+            task_id = Task._id_counter
+        self.id = task_id
+        Task._id_counter = max(Task._id_counter, task_id + 1)
         self.title = title
         self.description = description
         self.status = status
-        self.due_date = due_date
-        self.assignee = assignee
+        self.due_date = sys.intern(due_date) if isinstance(due_date, str) else due_date
+        self.assignee = sys.intern(assignee) if isinstance(assignee, str) else assignee
         self.progress = progress
 
     def to_dict(self):
@@ -38,8 +49,7 @@ class Task:
             status=TaskStatus[data['status'].replace(" ", "_").upper()],
             due_date=data['due_date'],
             assignee=data.get('assignee'),
-            progress=data.get('progress', 0)
+            progress=data.get('progress', 0),
+            task_id=data['id']
         )
-        task.id = data['id']
-        Task._id_counter = max(Task._id_counter, task.id + 1)
         return task
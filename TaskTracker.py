@@ -1,196 +1,378 @@
+import datetime
 import json
-from enum import Enum
-from tabulate import tabulate
-
-class TaskStatus(Enum):
-    OPEN = "Open"
-    IN_PROGRESS = "In Progress"
-    COMPLETED = "Completed"
-    OVERDUE = "Overdue"
-
-class Task:
-    _id_counter = 1
-
-    def __init__(self, title, description, status, due_date, assignee=None, progress=0):
-        self.id = Task._id_counter
-        Task._id_counter += 1
-        self.title = title
-        self.description = description
-        self.status = status
-        self.due_date = due_date
-        self.assignee = assignee
-        self.progress = progress
-
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'status': self.status.value,
-            'due_date': self.due_date,
-            'assignee': self.assignee,
-            'progress': self.progress
-        }
-
-    @classmethod
-    def from_dict(cls, data):
-        task = cls(
-            title=data['title'],
-            description=data['description'],
-            status=TaskStatus[data['status'].replace(" ", "_").upper()],
-            due_date=data['due_date'],
-            assignee=data.get('assignee'),
-            progress=data.get('progress', 0)
-        )
-        task.id = data['id']
-        Task._id_counter = max(Task._id_counter, task.id + 1)
-        return task
-
-class User:
-    def __init__(self, username, password, role):
-        self.username = username
-        self.password = password
-        self.role = role
-
-    def to_dict(self):
-        return {
-            'username': self.username,
-            'password': self.password,
-            'role': self.role
-        }
-
-    @classmethod
-    def from_dict(cls, data):
-        return cls(data['username'], data['password'], data['role'])
+import os
+import sys
+from contextlib import contextmanager
+from Task import Task, TaskStatus, is_valid_progress
+from task_store import TaskStore
+from storage import open_storage
+from decorators import QueryCache, cached_query
+from search_index import SearchIndex, append_log, text_record
+from query import Query
+from users import DEFAULT_ITERATIONS, User, UserRegistry
+import instrumentation
+
+# Форматы строк при выводе задач.
+TASK_ROW = "{task.id}: {task.title} - {task.status.value} - {task.assignee} - {task.progress}%"
+DEADLINE_ROW = "{task.id}: {task.title} - {task.due_date} - {task.assignee} - {task.progress}%"
+NOTIFICATION_ROW = "{task.id}: {task.title} - {task.status.value} - {task.due_date} - {task.assignee} - {task.progress}%"
+# Сколько строк накапливается перед записью в stdout.
+OUTPUT_CHUNK = 1000
 
 class TaskTracker:
     def __init__(self, config):
-        self.tasks = []
-        self.users = []
+        self.tasks = TaskStore()
+        self.users = UserRegistry()
         self.config = config
+        self.storage = open_storage(config)
+        self._pending_records = None
+        self.data_version = 0
+        self.query_cache = QueryCache(config.get('query_cache_size', 256))
+        if instrumentation.enabled_in(config):
+            instrumentation.enable(config, TaskTracker, type(self.storage).__mro__[:-1])
+            instrumentation.register_cache('query_cache', self.query_cache)
+        self.search_index = None
+        self.search_index_file = config.get('search_index_file', config.get('tasks_file', 'tasks.json') + '.search')
+        self._index_persisted = os.path.exists(self.search_index_file)
+        self._index_records = []
         self.load_tasks()
         self.load_users()
         self.current_user = None
 
     def add_task(self, task):
-        self.tasks.append(task)
+        self.tasks.add(task)
+        self._index_text(text_record(task))
+        self._record({'op': 'add', 'task': task.to_dict()})
 
     def remove_task(self, task_id):
-        self.tasks = [task for task in self.tasks if task.id != int(task_id)]
+        if self.tasks.remove(int(task_id)) is not None:
+            self._index_text({'op': 'remove', 'id': int(task_id)})
+            self._record({'op': 'remove', 'id': int(task_id)})
+            return True
+
+    # Изменение названия и/или описания задачи (None - оставить как есть).
+    def edit_task(self, task_id, title=None, description=None):
+        task = self.tasks.get(int(task_id))
+        if task is None:
+            return
+        if self.current_user.role == 'admin' or self.current_user.username == task.assignee:
+            self.tasks.set_text(task, task.title if title is None else title,
+                                task.description if description is None else description)
+            self._index_text(text_record(task))
+            self._record({'op': 'edit', 'id': task.id, 'title': task.title, 'description': task.description})
+            return True
+        else:
+            print("У вас нет прав для редактирования этой задачи.")
+            return False
 
     def change_task_status(self, task_id, new_status):
-        for task in self.tasks:
-            if task.id == int(task_id):
-                if self.current_user.role == 'admin' or self.current_user.username == task.assignee:
-                    task.status = TaskStatus[new_status.replace(" ", "_").upper()]
-                    return True
-                else:
-                    print("У вас нет прав для изменения статуса этой задачи.")
-                    return False
+        task = self.tasks.get(int(task_id))
+        if task is None:
+            return
+        if self.current_user.role == 'admin' or self.current_user.username == task.assignee:
+            self.tasks.set_status(task, TaskStatus[new_status.replace(" ", "_").upper()])
+            self._record({'op': 'status', 'id': task.id, 'status': task.status.value})
+            return True
+        else:
+            print("У вас нет прав для изменения статуса этой задачи.")
+            return False
 
     def update_task_progress(self, task_id, progress):
-        for task in self.tasks:
-            if task.id == int(task_id):
-                if self.current_user.role == 'admin' or self.current_user.username == task.assignee:
-                    task.progress = progress
-                    return True
-                else:
-                    print("У вас нет прав для изменения прогресса этой задачи.")
-                    return False
+        task = self.tasks.get(int(task_id))
+        if task is None:
+            return
+        if not is_valid_progress(progress):
+            print("Прогресс должен быть целым числом от 0 до 100.")
+            return False
+        if self.current_user.role == 'admin' or self.current_user.username == task.assignee:
+            self.tasks.set_progress(task, progress)
+            self._record({'op': 'progress', 'id': task.id, 'progress': progress})
+            return True
+        else:
+            print("У вас нет прав для изменения прогресса этой задачи.")
+            return False
+
+    # Исполнитель, которым ограничен просмотр: администратор видит все задачи (None),
+    # остальные пользователи только свои.
+    def _visible_assignee(self):
+        if self.current_user.role == 'admin':
+            return None
+        return self.current_user.username
+
+    # Запрос к задачам с учетом прав текущего пользователя (см. query.Query).
+    def query(self):
+        return Query(self.tasks).visible_to(self.current_user)
+
+    # Запросы на чтение возвращают кортежи задач и кэшируются до следующего изменения данных.
+    # visible_tasks(None) - все доступные пользователю задачи независимо от статуса.
+    @cached_query
+    def visible_tasks(self, show_completed=False):
+        query = self.query()
+        if show_completed:
+            query = query.status(TaskStatus.COMPLETED)
+        elif show_completed is not None:
+            query = query.status(*[status for status in TaskStatus if status != TaskStatus.COMPLETED])
+        return tuple(query)
+
+    @cached_query
+    def tasks_by_status(self, status):
+        return tuple(self.query().status(status))
+
+    @cached_query
+    def tasks_by_assignee(self, assignee):
+        return tuple(self.query().assignee(assignee))
+
+    @cached_query
+    def task_deadlines(self):
+        return tuple(self.query().order_by('due_date'))
+
+    # Уведомления берутся из ящика исполнителя, который хранилище ведет при изменении задач.
+    @cached_query
+    def notifications(self):
+        return tuple(self.tasks.inbox(self._visible_assignee()))
+
+    # Изменение текста задачи применяется к загруженному поисковому индексу и, если индекс
+    # сохранен на диске, запоминается для его журнала (записывается в save_tasks). Сам индекс
+    # ради изменения не загружается; пока поиском не пользовались, изменения не запоминаются.
+    def _index_text(self, record):
+        if self.search_index is not None:
+            self.search_index.apply(record)
+        if self._index_persisted:
+            self._index_records.append(record)
+
+    # Поисковый индекс загружается из файла (снимок и журнал) или строится при первом поиске.
+    def _text_index(self):
+        if self.search_index is None:
+            index = SearchIndex.load(self.search_index_file, self.tasks, self._index_records)
+            built = index is None
+            if built:
+                print("Построение поискового индекса...")
+                index = SearchIndex(self.tasks)
+            if built or index.needs_compaction():
+                index.save(self.search_index_file)
+                self._index_records = []
+            self.search_index = index
+            self._index_persisted = True
+        return self.search_index
+
+    # Задачи, найденные по словам запроса (каждое слово - префикс), в порядке релевантности.
+    @cached_query
+    def search_tasks(self, query, limit=20):
+        visible = self._visible_assignee()
+        allowed = None if visible is None else lambda task_id: self.tasks.get(task_id).assignee == visible
+        return tuple(self.tasks.get(task_id) for _, task_id in self._text_index().search(query, limit, allowed))
+
+    # Вывод задач строками формата row. Строки пишутся в stdout порциями; в терминале
+    # вывод разбивается на страницы по page_size строк (config "page_size", 0 - без страниц).
+    # Возвращает количество выведенных задач.
+    def print_tasks(self, tasks, row=TASK_ROW, page_size=None):
+        if page_size is None:
+            page_size = self.config.get('page_size', 50) if sys.stdin.isatty() and sys.stdout.isatty() else 0
+        lines = []
+        shown = 0
+        for task in tasks:
+            if page_size and shown and shown % page_size == 0:
+                sys.stdout.write("".join(lines))
+                lines = []
+                if input("Enter - следующая страница, q - выход: ").strip().lower() == 'q':
+                    return shown
+            lines.append(row.format(task=task) + "\n")
+            shown += 1
+            if len(lines) >= OUTPUT_CHUNK:
+                sys.stdout.write("".join(lines))
+                lines = []
+        sys.stdout.write("".join(lines))
+        return shown
 
     def display_tasks(self, show_completed=False):
-        for task in self.tasks:
-            if self.current_user.role == 'admin' or task.assignee == self.current_user.username:
-                if show_completed:
-                    if task.status == TaskStatus.COMPLETED:
-                        print(f"{task.id}: {task.title} - {task.status.value} - {task.assignee} - {task.progress}%")
-                else:
-                    if task.status != TaskStatus.COMPLETED:
-                        print(f"{task.id}: {task.title} - {task.status.value} - {task.assignee} - {task.progress}%")
+        self.print_tasks(self.visible_tasks(show_completed))
 
     def display_tasks_by_status(self, status):
-        for task in self.tasks:
-            if self.current_user.role == 'admin' or task.assignee == self.current_user.username:
-                if task.status == TaskStatus[status.replace(" ", "_").upper()]:
-                    print(f"{task.id}: {task.title} - {task.status.value} - {task.assignee} - {task.progress}%")
+        self.print_tasks(self.tasks_by_status(TaskStatus[status.replace(" ", "_").upper()]))
 
     def display_tasks_by_assignee(self, assignee):
-        for task in self.tasks:
-            if self.current_user.role == 'admin' or task.assignee == self.current_user.username:
-                if task.assignee == assignee:
-                    print(f"{task.id}: {task.title} - {task.status.value} - {task.assignee} - {task.progress}%")
+        self.print_tasks(self.tasks_by_assignee(assignee))
 
     def display_task_deadlines(self):
-        for task in self.tasks:
-            if self.current_user.role == 'admin' or task.assignee == self.current_user.username:
-                print(f"{task.id}: {task.title} - {task.due_date} - {task.assignee} - {task.progress}%")
+        self.print_tasks(self.task_deadlines(), DEADLINE_ROW)
+
+    def display_search_results(self, query, limit=20):
+        tasks = self.search_tasks(query, limit)
+        if not tasks:
+            print("Задачи не найдены.")
+        self.print_tasks(tasks)
+
+    # Перевод незавершенных задач с истекшим сроком в статус OVERDUE.
+    def promote_overdue(self, today=None):
+        promoted = self.tasks.promote_overdue(today or datetime.date.today())
+        for task in promoted:
+            self._record({'op': 'status', 'id': task.id, 'status': task.status.value})
+        return promoted
 
     def toggle_show_completed(self):
         self.config['show_completed'] = not self.config.get('show_completed', False)
         self.save_config()
         self.display_tasks(show_completed=self.config['show_completed'])
 
+    # Каждое изменение задач передается хранилищу; в режиме журнала оно сразу
+    # дописывается в журнал, в обычном режиме сохраняется при save_tasks.
+    def _record(self, record):
+        self.data_version += 1
+        if self._pending_records is not None:
+            self._pending_records.append(record)
+        else:
+            self.storage.append([record])
+
+    # Пакетный режим: изменения внутри блока with копятся и сохраняются один раз в конце.
+    # Если блок прерван исключением, накопленные изменения пакета не сохраняются.
+    @contextmanager
+    def batch(self):
+        self.begin_batch()
+        try:
+            yield
+        except BaseException:
+            self._pending_records = None
+            raise
+        self.commit_batch()
+
+    # Уже открытый пакет (например, оставшийся после неудачного сохранения) продолжается.
+    def begin_batch(self):
+        if self._pending_records is None:
+            self._pending_records = []
+
+    # Сохранение накопленных изменений; возвращает их количество. Если сохранить не удалось,
+    # пакет остается открытым с теми же изменениями, чтобы их можно было сохранить повторно.
+    def commit_batch(self):
+        records, self._pending_records = self._pending_records, None
+        if records:
+            try:
+                self.storage.append(records)
+                self.save_tasks()
+            except Exception:
+                self._pending_records = records
+                raise
+        return len(records or ())
+
+    # Хранилище может дополнить задачи изменениями других процессов, поэтому кэш сбрасывается.
     def save_tasks(self):
-        with open(self.config['tasks_file'], 'w') as file:
-            json.dump([task.to_dict() for task in self.tasks], file, indent=4)
+        self.storage.save_tasks(self.tasks)
+        self.data_version += 1
+        if getattr(self.storage, 'merged', False):
+            self._drop_text_index()
+        elif self._index_records:
+            append_log(self.search_index_file, self._index_records)
+            self._index_records = []
+
+    # После слияния шардов в хранилище есть задачи другого процесса, а новые задачи могли
+    # получить другие ID: индекс и его файлы удаляются и строятся заново при следующем поиске.
+    def _drop_text_index(self):
+        self.search_index = None
+        self._index_records = []
+        self._index_persisted = False
+        for path in (self.search_index_file, self.search_index_file + '.log'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
 
     def load_tasks(self):
+        self.data_version += 1
+        self.search_index = None
+        self._index_records = []
         try:
-            with open(self.config['tasks_file'], 'r') as file:
-                tasks_data = json.load(file)
-                self.tasks = [Task.from_dict(data) for data in tasks_data]
+            self.tasks = self.storage.open_store()
         except (FileNotFoundError, json.JSONDecodeError):
             print("Файл со списком задач не найден или поврежден. Создание нового списка задач.")
-            self.tasks = []
+            self.tasks = TaskStore()
 
     def save_users(self):
-        with open('users.json', 'w') as file:
-            json.dump([user.to_dict() for user in self.users], file, indent=4)
+        self.storage.save_users(self.users)
 
     def load_users(self):
+        iterations = self.config.get('password_iterations', DEFAULT_ITERATIONS)
         try:
-            with open('users.json', 'r') as file:
-                users_data = json.load(file)
-                self.users = [User.from_dict(data) for data in users_data]
+            self.users = UserRegistry((User.from_dict(data) for data in self.storage.load_users()), iterations)
         except (FileNotFoundError, json.JSONDecodeError):
             print("Файл с пользователями не найден или поврежден. Создание нового списка пользователей.")
-            self.users = []
+            self.users = UserRegistry(iterations=iterations)
 
     def save_config(self):
         with open('config.json', 'w') as file:
             json.dump(self.config, file, indent=4)
 
+    # Сводка по доступным пользователю задачам из счетчиков хранилища, без просмотра задач.
+    def summary(self):
+        return self.tasks.summary(self._visible_assignee())
+
+    def display_summary(self):
+        summary = self.summary()
+        statuses = ", ".join(f"{status.value}: {count}" for status, count in summary['statuses'].items())
+        print(f"Задач: {summary['total']} ({statuses}), средний прогресс: {summary['average_progress']:.1f}%")
+
+    # Аналитический отчет (модуль analytics, нужен NumPy) по доступным пользователю задачам.
+    def analytics_report(self, period_days=7):
+        import analytics  # NumPy загружается только для этого отчета
+        if analytics.np is None:
+            print("Для аналитического отчета нужен пакет numpy (pip install numpy).")
+            return None
+        visible = self._visible_assignee()
+        tasks = self.tasks if visible is None else self.tasks.find(assignee=visible)
+        result = analytics.compute(tasks, period_days)
+        analytics.print_report(result, self.tasks.assignee_counts() if visible is None else None)
+        return result
+
     def notify_user(self):
         print("Уведомления о задачах:")
-        for task in self.tasks:
-            if self.current_user.role == 'admin':
-                if task.status in [TaskStatus.OPEN, TaskStatus.OVERDUE]:
-                    print(f"{task.id}: {task.title} - {task.status.value} - {task.due_date} - {task.assignee} - {task.progress}%")
-            elif self.current_user.username == task.assignee:
-                if task.status in [TaskStatus.OPEN, TaskStatus.OVERDUE]:
-                    print(f"{task.id}: {task.title} - {task.status.value} - {task.due_date} - {task.assignee} - {task.progress}%")
-
-    def generate_report(self):
-        headers = ["ID", "Title", "Description", "Status", "Due Date", "Assignee", "Progress"]
-        rows = [[task.id, task.title, task.description, task.status.value, task.due_date, task.assignee, f"{task.progress}%"] for task in self.tasks]
-        report = tabulate(rows, headers, tablefmt="grid")
-        print("Отчет по задачам:")
-        print(report)
-        with open("task_report.txt", "w") as file:
-            file.write(report)
+        self.print_tasks(self.notifications(), NOTIFICATION_ROW)
+
+    # Отчет пишется в файл потоком, по тем же фильтрам и правам доступа, что и при просмотре задач.
+    # Таблица (grid) одновременно выводится на экран.
+    def generate_report(self, report_format='grid', status=None, assignee=None, path=None):
+        from reports import REPORT_FILES, write_report  # модуль отчетов нужен только здесь
+        statuses = [TaskStatus[status.replace(" ", "_").upper()]] if status else None
+        visible = self._visible_assignee()
+        if visible is not None:
+            if assignee is not None and assignee != visible:
+                print("У вас нет прав для просмотра задач этого исполнителя.")
+                return 0
+            assignee = visible
+        if assignee is None and statuses is None:
+            tasks = lambda: iter(self.tasks)
+        else:
+            tasks = lambda: self.tasks.find(assignee=assignee, statuses=statuses)
+        path = path or REPORT_FILES[report_format]
+        echo = report_format == 'grid'
+        if echo:
+            print("Отчет по задачам:")
+        count = write_report(path, tasks, report_format, echo=echo)
+        print(f"Отчет сохранен в {path} (задач: {count}).")
+        return count
+
+    # Пароль открытым текстом из старого файла при успешном входе заменяется хэшем и сохраняется.
+    def authenticate(self, username, password):
+        user = self.users.authenticate(username, password)
+        if self.users.changed:
+            self.users.changed = False
+            self.save_users()
+        return user
 
     def login(self, username, password):
-        for user in self.users:
-            if user.username == username and user.password == password:
-                self.current_user = user
-                print(f"Добро пожаловать, {username}!")
-                self.notify_user()  # Добавляем вызов метода notify_user при входе в систему
-                return True
+        user = self.authenticate(username, password)
+        if user is not None:
+            self.current_user = user
+            self.promote_overdue()
+            print(f"Добро пожаловать, {username}!")
+            self.display_summary()
+            self.notify_user()  # Добавляем вызов метода notify_user при входе в систему
+            return True
         print("Неверное имя пользователя или пароль.")
         return False
 
     def register_user(self, username, password, role):
-        new_user = User(username, password, role)
-        self.users.append(new_user)
-        self.save_users()
+        new_user = self.users.register(username, password, role)
+        if new_user is None:
+            print(f"Пользователь {username} уже существует.")
+            return False
+        self.storage.add_user(new_user, self.users)
         print(f"Пользователь {username} зарегистрирован.")
+        return True
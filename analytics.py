@@ -0,0 +1,97 @@
+#Аналитический отчет по задачам на NumPy.
+# Задачи один раз переводятся в столбцы (код статуса, прогресс, номер дня срока), после чего
+# распределение прогресса и burndown по срокам считаются векторными операциями над массивами,
+# без цикла Python по задачам. NumPy - необязательная зависимость: без него отчет недоступен,
+# остальные функции трекера работают как обычно.
+import datetime
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from Task import TaskStatus
+from task_store import NO_DUE_DATE, due_ordinal
+
+STATUS_CODES = {status: code for code, status in enumerate(TaskStatus)}
+# Корзины прогресса по 10%: 0-9, 10-19, ..., 90-100.
+PROGRESS_BINS = 10
+
+
+def task_columns(tasks):
+    statuses = array('b')
+    progress = array('h')
+    due = array('i')
+    codes = STATUS_CODES
+    for task in tasks:
+        statuses.append(codes[task.status])
+        progress.append(task.progress)
+        due.append(due_ordinal(task.due_date))
+    return np.frombuffer(statuses, np.int8), np.frombuffer(progress, np.int16), np.frombuffer(due, np.int32)
+
+
+# Распределение прогресса по статусам и burndown: для каждого периода period_days дней
+# (начиная с самого раннего срока) - сколько задач со сроком в этом периоде, сколько из них
+# выполнено, сколько работы по ним осталось (в задачах, с учетом прогресса) и сколько
+# невыполненной работы приходится на более поздние периоды.
+def compute(tasks, period_days=7, today=None):
+    status, progress, due = task_columns(tasks)
+    today = (today or datetime.date.today()).toordinal()
+    completed = status == STATUS_CODES[TaskStatus.COMPLETED]
+    has_due = due != NO_DUE_DATE
+    # Прогресс вне 0-100 (из старых файлов) попадает в крайние корзины.
+    bins = np.clip(progress // (100 // PROGRESS_BINS), 0, PROGRESS_BINS - 1)
+    result = {
+        'total': len(status),
+        'average_progress': float(progress.mean()) if len(progress) else 0.0,
+        'progress_quartiles': [float(value) for value in np.percentile(progress, [25, 50, 75])] if len(progress) else [],
+        'overdue': int(np.count_nonzero(~completed & has_due & (due < today))),
+        'histogram': {status_value.value: np.bincount(bins[status == code], minlength=PROGRESS_BINS).tolist()
+                      for status_value, code in STATUS_CODES.items()},
+        'burndown': [],
+    }
+    if not has_due.any():
+        return result
+    due = due[has_due]
+    first = int(due.min())
+    period = (due - first) // period_days
+    remaining = (100 - progress[has_due].astype(np.float64)) / 100 * ~completed[has_due]
+    due_count = np.bincount(period)
+    done_count = np.bincount(period, weights=completed[has_due])
+    remaining_work = np.bincount(period, weights=remaining)
+    outstanding = remaining_work.sum() - np.cumsum(remaining_work)
+    for index in np.flatnonzero(due_count):
+        result['burndown'].append({
+            'start': datetime.date.fromordinal(first + int(index) * period_days).isoformat(),
+            'due': int(due_count[index]),
+            'completed': int(done_count[index]),
+            'remaining': round(float(remaining_work[index]), 2),
+            'outstanding': round(float(outstanding[index]), 2),
+        })
+    return result
+
+
+def print_report(result, assignee_counts=None, top=10):
+    print(f"Задач: {result['total']}, средний прогресс: {result['average_progress']:.1f}%, "
+          f"просрочено: {result['overdue']}")
+    if result['progress_quartiles']:
+        low, median, high = result['progress_quartiles']
+        print(f"Прогресс: 25% - {low:.0f}%, медиана - {median:.0f}%, 75% - {high:.0f}%")
+    print("\nРаспределение прогресса (корзины по 10%):")
+    print(f"{'Статус':12}" + "".join(f"{bucket * 10:>8}%" for bucket in range(PROGRESS_BINS)))
+    for status, counts in result['histogram'].items():
+        print(f"{status:12}" + "".join(f"{count:>9}" for count in counts))
+    if result['burndown']:
+        print("\nBurndown по срокам:")
+        print(f"{'Период с':12}{'Срок':>10}{'Выполнено':>12}{'Осталось':>12}{'Далее':>12}")
+        for row in result['burndown']:
+            print(f"{row['start']:12}{row['due']:>10}{row['completed']:>12}{row['remaining']:>12.2f}"
+                  f"{row['outstanding']:>12.2f}")
+    if assignee_counts:
+        print(f"\nИсполнители с наибольшим числом незавершенных задач (до {top}):")
+        pending = sorted(((sum(count for status, count in counts.items() if status != TaskStatus.COMPLETED),
+                           assignee) for assignee, counts in assignee_counts.items()),
+                         key=lambda item: (-item[0], str(item[1])))
+        for count, assignee in pending[:top]:
+            print(f"{assignee}: {count}")
@@ -0,0 +1,36 @@
+#Генераторы синтетических задач и пользователей для бенчмарков.
+# Одинаковый seed дает одинаковые данные, поэтому результаты разных запусков сравнимы.
+import datetime
+import random
+
+from Task import TaskStatus
+
+STATUSES = [status.value for status in TaskStatus]
+WORDS = ["отчет", "ревью", "deploy", "fix", "тест", "api", "база", "design", "митинг", "release"]
+
+
+def generate_users(count, seed=0, admins=1):
+    rng = random.Random(seed)
+    users = []
+    for i in range(count):
+        users.append({
+            'username': f"user{i}",
+            'password': str(rng.randrange(10 ** 6)),
+            'role': 'admin' if i < admins else 'user'
+        })
+    return users
+
+
+def generate_task_dicts(count, users=1000, seed=0):
+    rng = random.Random(seed)
+    start = datetime.date(2025, 1, 1).toordinal()
+    for i in range(1, count + 1):
+        yield {
+            'id': i,
+            'title': " ".join(rng.choices(WORDS, k=3)),
+            'description': " ".join(rng.choices(WORDS, k=8)),
+            'status': rng.choice(STATUSES),
+            'due_date': datetime.date.fromordinal(start + rng.randrange(730)).isoformat(),
+            'assignee': f"user{rng.randrange(users)}",
+            'progress': rng.randrange(101)
+        }
@@ -0,0 +1,147 @@
+#Нагрузочный тест HTTP API (server.py): несколько одновременных клиентов с keep-alive
+# отправляют смесь запросов на чтение и изменение задач, в конце выводятся число
+# запросов в секунду и задержки (p50, p99).
+# Существующие задачи не изменяются: тест сам создает задачи с названием LOAD_TITLE, меняет
+# статус и прогресс только у них и в конце удаляет все созданные задачи (нужны права администратора).
+# Запуск из корня проекта при запущенном сервере:
+#   python -m benchmarks.loadtest --user Olga --password 1 --clients 50 --requests 20000
+import argparse
+import asyncio
+import base64
+import json
+import random
+import time
+
+LOAD_TITLE = 'loadtest'
+LOAD_TASK = {'title': LOAD_TITLE, 'description': 'test', 'due_date': '2030-01-01', 'assignee': 'load'}
+
+
+class Client:
+    def __init__(self, host, port, auth):
+        self.host = host
+        self.port = port
+        self.auth = auth
+        self.reader = None
+        self.writer = None
+
+    # Возвращает код ответа и тело (для ответов с Content-Length).
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nAuthorization: Basic {self.auth}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        self.writer.write(head.encode('latin-1') + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        body = b''
+        if headers.get('transfer-encoding') == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            body = await self.reader.readexactly(int(headers.get('content-length', 0)))
+        return status, body
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def create_task(client, task_ids):
+    status, body = await client.request('POST', '/tasks', LOAD_TASK)
+    if status == 201:
+        task_ids.append(json.loads(body)['id'])
+    return status
+
+
+async def worker(client, rng, task_ids, remaining, latencies, errors):
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        roll = rng.random()
+        start = time.perf_counter()
+        if roll < 0.5 or not task_ids:
+            status, _ = await client.request('GET', '/tasks?status=OPEN')
+        elif roll < 0.7:
+            status = await create_task(client, task_ids)
+        else:
+            if roll < 0.85:
+                path, payload = f"/tasks/{rng.choice(task_ids)}/progress", {'progress': rng.randrange(101)}
+            else:
+                path, payload = f"/tasks/{rng.choice(task_ids)}/status", {
+                    'status': rng.choice(['OPEN', 'IN_PROGRESS', 'COMPLETED'])}
+            status, _ = await client.request('POST', path, payload)
+        latencies.append(time.perf_counter() - start)
+        if status >= 400 and status != 404:
+            errors[status] = errors.get(status, 0) + 1
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(args):
+    auth = base64.b64encode(f"{args.user}:{args.password}".encode('utf-8')).decode('ascii')
+    probe = Client(args.host, args.port, auth)
+    task_ids = []
+    probe_status = await create_task(probe, task_ids)
+    probe.close()
+    if probe_status != 201:
+        print(f"Сервер ответил {probe_status}; нужны имя и пароль администратора.")
+        return 1
+    rng = random.Random(args.seed)
+    remaining = [args.requests]
+    latencies = []
+    errors = {}
+    clients = [Client(args.host, args.port, auth) for _ in range(args.clients)]
+    try:
+        for _ in range(args.tasks - 1):
+            await create_task(clients[0], task_ids)
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client, random.Random(rng.random()), task_ids, remaining, latencies, errors)
+                               for client in clients))
+        elapsed = time.perf_counter() - start
+    finally:
+        for client in clients:
+            client.close()
+        # Удаление созданных задач выполняется и при прерывании теста.
+        cleanup = Client(args.host, args.port, auth)
+        for task_id in task_ids:
+            await cleanup.request('DELETE', f"/tasks/{task_id}")
+        cleanup.close()
+        print(f"Удалено созданных тестом задач: {len(task_ids)}")
+
+    latencies.sort()
+    print(f"Запросов: {len(latencies)} за {elapsed:.2f} с, клиентов: {args.clients}")
+    print(f"Пропускная способность: {len(latencies) / elapsed:.0f} запросов/с")
+    print(f"Задержка p50: {percentile(latencies, 0.5) * 1e3:.2f} мс, p99: {percentile(latencies, 0.99) * 1e3:.2f} мс")
+    if errors:
+        print(f"Ошибки: {errors}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Нагрузочный тест HTTP API трекера задач.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--user', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--clients', type=int, default=50, help="одновременных соединений")
+    parser.add_argument('--requests', type=int, default=10000, help="всего запросов")
+    parser.add_argument('--tasks', type=int, default=100, help="задач, создаваемых тестом перед началом")
+    parser.add_argument('--seed', type=int, default=0)
+    return asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
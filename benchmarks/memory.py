@@ -0,0 +1,46 @@
+#Сравнение памяти, занимаемой задачами: прежний Task с __dict__ и текущий Task с __slots__.
+# Запуск из корня проекта: python -m benchmarks.memory [количество задач]
+import gc
+import sys
+import tracemalloc
+
+from Task import Task, TaskStatus
+from benchmarks.generators import generate_task_dicts
+
+
+# Прежнее представление задачи: обычный объект со словарем атрибутов.
+class LegacyTask:
+    def __init__(self, task_id, title, description, status, due_date, assignee=None, progress=0):
+        self.id = task_id
+        self.title = title
+        self.description = description
+        self.status = status
+        self.due_date = due_date
+        self.assignee = assignee
+        self.progress = progress
+
+
+def measure(build, count):
+    gc.collect()
+    tracemalloc.start()
+    tasks = [build(data) for data in generate_task_dicts(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    return size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    legacy = measure(lambda data: LegacyTask(data['id'], data['title'], data['description'],
+                                             TaskStatus(data['status']), data['due_date'],
+                                             data['assignee'], data['progress']), count)
+    compact = measure(Task.from_dict, count)
+    print(f"Задач: {count}")
+    print(f"Task с __dict__:  {legacy / 2 ** 20:8.1f} МБ ({legacy / count:6.0f} байт на задачу)")
+    print(f"Task с __slots__: {compact / 2 ** 20:8.1f} МБ ({compact / count:6.0f} байт на задачу)")
+    print(f"Экономия: {(1 - compact / legacy) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#Бенчмарк TaskTracker на синтетических данных.
+# Каждый размер набора задач измеряется в отдельном процессе, чтобы пиковая память
+# (максимальный RSS) относилась только к нему. Вывод методов трекера подавляется,
+# чтобы печать не искажала время. Запуск из корня проекта:
+#   python -m benchmarks.suite --sizes 10000 100000 --output bench_results.json
+#   python -m benchmarks.suite --sizes 10000 --baseline bench_baseline.json
+# С --baseline время каждой операции сравнивается с сохраненным результатом; если медиана
+# выросла больше чем на --threshold (по умолчанию 20%), операция отмечается как регрессия
+# и процесс завершается с кодом 1.
+import argparse
+import contextlib
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.generators import generate_task_dicts, generate_users
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def write_dataset(size, users, seed):
+    with open('tasks.json', 'w', encoding='utf-8') as file:
+        file.write('[')
+        for i, data in enumerate(generate_task_dicts(size, users=users, seed=seed)):
+            file.write(',\n' if i else '\n')
+            json.dump(data, file)
+        file.write('\n]')
+    users_data = generate_users(users, seed=seed)
+    with open('users.json', 'w', encoding='utf-8') as file:
+        json.dump(users_data, file)
+    return users_data
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss в килобайтах в Linux и в байтах в macOS.
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+# Выполняет func repeat раз с подавленным выводом; per_call делит время на число операций внутри func.
+def measure(results, name, func, repeat=1, per_call=1):
+    timings = []
+    result = None
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append((time.perf_counter() - start) / per_call)
+    results[name] = {'min_s': min(timings), 'median_s': statistics.median(timings), 'runs': repeat}
+    return result
+
+
+def run_size(size, users, seed, backend, repeat):
+    import TaskTracker
+
+    rng = random.Random(seed)
+    workdir = tempfile.mkdtemp(prefix='task-tracker-bench-')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        users_data = write_dataset(size, users, seed)
+        # load_tasks - холодная загрузка без снимка *.cache, load_tasks_cached - загрузка из снимка.
+        config = {'tasks_file': 'tasks.json', 'storage_backend': backend, 'load_progress_every': 0,
+                  'snapshot_cache': False}
+        if backend == 'sqlite':
+            from sqlite_storage import SqliteStorage
+            SqliteStorage(config).import_json('tasks.json', 'users.json')
+
+        ops = {}
+        tracker = measure(ops, 'load_tasks', lambda: TaskTracker.TaskTracker(config), repeat)
+        if backend != 'sqlite':
+            cached_config = dict(config, snapshot_cache=True)
+            TaskTracker.TaskTracker(cached_config)
+            measure(ops, 'load_tasks_cached', lambda: TaskTracker.TaskTracker(cached_config), repeat)
+        # В users.json пароли открытым текстом; первый вход (login_first) заменяет пароль хэшем,
+        # а перед каждым замеряемым входом сбрасывается кэш проверок, чтобы измерялась проверка PBKDF2.
+        admin_data, user_data = users_data[0], users_data[1 % len(users_data)]
+        admin, user = tracker.users.get(admin_data['username']), tracker.users.get(user_data['username'])
+        measure(ops, 'login_first', lambda: tracker.login(admin_data['username'], admin_data['password']))
+
+        def login():
+            tracker.users.forget_verified()
+            return tracker.login(admin_data['username'], admin_data['password'])
+        measure(ops, 'login', login, repeat)
+        measure(ops, 'save_tasks', tracker.save_tasks, repeat)
+
+        def uncached(func, *args):
+            def call():
+                tracker.query_cache.clear()
+                return func(*args)
+            return call
+
+        for current in (admin, user):
+            tracker.current_user = current
+            suffix = '' if current is admin else '[user]'
+            measure(ops, 'notify_user' + suffix, uncached(tracker.notify_user), repeat)
+            measure(ops, 'display_tasks' + suffix, uncached(tracker.display_tasks), repeat)
+            measure(ops, 'display_tasks_by_status' + suffix, uncached(tracker.display_tasks_by_status, 'OPEN'), repeat)
+            measure(ops, 'display_tasks_by_assignee' + suffix,
+                    uncached(tracker.display_tasks_by_assignee, user.username), repeat)
+            measure(ops, 'display_task_deadlines' + suffix, uncached(tracker.display_task_deadlines), repeat)
+
+        tracker.current_user = admin
+        measure(ops, 'generate_report', tracker.generate_report, repeat)
+
+        count = min(1000, size)
+        ids = rng.sample(range(1, size + 1), count)
+        statuses = ['OPEN', 'IN_PROGRESS', 'COMPLETED']
+        measure(ops, 'change_task_status', lambda: [tracker.change_task_status(task_id, rng.choice(statuses))
+                                                    for task_id in ids], per_call=count)
+        measure(ops, 'remove_task', lambda: [tracker.remove_task(task_id) for task_id in ids], per_call=count)
+        return {'ops': ops, 'peak_rss_mb': peak_rss_mb()}
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_in_subprocess(size, args):
+    command = [sys.executable, '-m', 'benchmarks.suite', '--worker', str(size), '--users', str(args.users),
+               '--seed', str(args.seed), '--backend', args.backend, '--repeat', str(args.repeat)]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run(command, cwd=root, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for size, current in results['sizes'].items():
+        base = baseline.get('sizes', {}).get(size)
+        if base is None:
+            continue
+        for name, timing in current['ops'].items():
+            base_timing = base['ops'].get(name)
+            if base_timing is None or base_timing['median_s'] <= 0:
+                continue
+            ratio = timing['median_s'] / base_timing['median_s']
+            if ratio > 1 + threshold:
+                regressions.append((size, name, base_timing['median_s'], timing['median_s'], ratio))
+    return regressions
+
+
+def print_results(results):
+    for size, current in results['sizes'].items():
+        peak = current['peak_rss_mb']
+        print(f"\nЗадач: {size}" + (f", пиковая память: {peak:.1f} МБ" if peak is not None else ""))
+        for name, timing in current['ops'].items():
+            print(f"  {name:32} {timing['median_s'] * 1e3:12.3f} мс")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк TaskTracker на синтетических данных.")
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10000, 100000], help="количества задач")
+    parser.add_argument('--users', type=int, default=1000, help="количество пользователей")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backend', default='json', choices=['json', 'journal', 'sqlite'])
+    parser.add_argument('--repeat', type=int, default=3, help="повторов каждой операции")
+    parser.add_argument('--output', default='bench_results.json', help="файл с результатами (JSON)")
+    parser.add_argument('--baseline', help="файл с прежними результатами для сравнения")
+    parser.add_argument('--threshold', type=float, default=0.2, help="допустимый рост времени (доля)")
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        print(json.dumps(run_size(args.worker, args.users, args.seed, args.backend, args.repeat)))
+        return 0
+
+    results = {
+        'meta': {'users': args.users, 'seed': args.seed, 'backend': args.backend, 'repeat': args.repeat,
+                 'python': sys.version.split()[0], 'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+        'sizes': {}
+    }
+    for size in args.sizes:
+        print(f"Измерение для {size} задач...")
+        results['sizes'][str(size)] = run_in_subprocess(size, args)
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=4)
+    print_results(results)
+    print(f"\nРезультаты сохранены в {args.output}.")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for size, name, before, after, ratio in regressions:
+            print(f"РЕГРЕССИЯ: {size} задач, {name}: {before * 1e3:.3f} мс -> {after * 1e3:.3f} мс (x{ratio:.2f})")
+        if regressions:
+            return 1
+        print("Регрессий не обнаружено.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+#Неинтерактивный режим командной строки для пакетных операций.
+# Все изменения одной команды выполняются в tracker.batch() и сохраняются один раз в конце.
+# Примеры:
+#   python main.py --user Olga --password 1 import tasks.ndjson [--upsert]
+#   python main.py --user Olga --password 1 bulk-status --assignee Olga --to COMPLETED
+#   python main.py --user Olga --password 1 delete 3 4 5
+#   python main.py --user Olga --password 1 search "отчет квартал" --limit 10
+#   python main.py --user Olga --password 1 list --status OPEN --due-to 2025-12-31 --sort due_date --limit 50 --offset 100
+#   python main.py --user Olga --password 1 analytics --period 7
+#   python main.py migrate
+#   python main.py stats
+#   python main.py serve --port 8080
+#   python main.py startup-time --budget-ms 500
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import TaskTracker
+from storage import iter_json_array
+from Task import Task, TaskStatus, is_valid_progress
+from query import SORT_KEYS
+
+
+def parse_status(name):
+    return TaskStatus[name.replace(" ", "_").upper()]
+
+
+def status_value(text):
+    try:
+        return parse_status(text)
+    except KeyError:
+        names = ", ".join(status.name for status in TaskStatus)
+        raise argparse.ArgumentTypeError(f"неизвестный статус {text!r} (допустимые: {names})")
+
+
+def progress_value(text):
+    progress = int(text)
+    if not is_valid_progress(progress):
+        raise argparse.ArgumentTypeError("прогресс должен быть от 0 до 100")
+    return progress
+
+
+# Проверка записи импорта; ValueError с описанием, если запись нельзя превратить в задачу.
+def check_import_record(data):
+    if not isinstance(data, dict):
+        raise ValueError("запись должна быть JSON-объектом")
+    task_id = data.get('id')
+    if task_id is not None and (not isinstance(task_id, int) or isinstance(task_id, bool) or task_id < 1):
+        raise ValueError(f"ID должен быть целым положительным числом: {task_id!r}")
+    if not isinstance(data.get('title'), str):
+        raise ValueError("не указано название задачи")
+    for name in ('description', 'due_date', 'assignee'):
+        if data.get(name) is not None and not isinstance(data[name], str):
+            raise ValueError(f"поле {name} должно быть строкой: {data[name]!r}")
+    if not is_valid_progress(data.get('progress', 0)):
+        raise ValueError(f"прогресс должен быть целым числом от 0 до 100: {data.get('progress')!r}")
+    try:
+        parse_status(data.get('status', TaskStatus.OPEN.value))
+    except (KeyError, AttributeError):
+        raise ValueError(f"неизвестный статус: {data.get('status')!r}")
+
+
+def task_from_import(data):
+    check_import_record(data)
+    return Task(
+        title=data['title'],
+        description=data.get('description') or '',
+        status=parse_status(data.get('status', TaskStatus.OPEN.value)),
+        due_date=data.get('due_date'),
+        assignee=data.get('assignee'),
+        progress=data.get('progress', 0),
+        task_id=data.get('id')
+    )
+
+
+# Задачи из файла NDJSON (по задаче в строке) или JSON-массива, читаются потоково.
+# Строки NDJSON с неверным JSON не прерывают чтение: описание ошибки добавляется в errors.
+def read_import_file(path, errors):
+    with open(path, 'r', encoding='utf-8') as file:
+        if path.endswith(('.ndjson', '.jsonl')):
+            for number, line in enumerate(file, 1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as error:
+                        errors.append(f"строка {number}: {error}")
+        else:
+            yield from iter_json_array(file)
+
+
+def selected_task_ids(tracker, args):
+    if args.ids:
+        return args.ids
+    statuses = [args.status] if args.status else None
+    return [task.id for task in tracker.tasks.find(assignee=args.assignee, statuses=statuses)]
+
+
+# Задача с уже существующим ID получает новый ID; заменить существующую задачу можно
+# только явно, с флагом --upsert. Записи с неверными данными пропускаются.
+def cmd_import(tracker, args):
+    count = renumbered = skipped = 0
+    errors = []
+    for data in read_import_file(args.file, errors):
+        try:
+            check_import_record(data)
+        except ValueError as error:
+            print(f"Запись пропущена ({error}): {data}")
+            skipped += 1
+            continue
+        if not args.upsert and data.get('id') is not None and data['id'] in tracker.tasks:
+            data = dict(data, id=None)
+            renumbered += 1
+        tracker.add_task(task_from_import(data))
+        count += 1
+    for error in errors:
+        print(f"Запись пропущена (неверный JSON, {error})")
+    if renumbered:
+        print(f"Задач с уже существующим ID, получивших новый ID: {renumbered}.")
+    if skipped or errors:
+        print(f"Пропущено записей: {skipped + len(errors)}.")
+    return count
+
+
+def cmd_delete(tracker, args):
+    return sum(1 for task_id in args.ids if tracker.remove_task(task_id))
+
+
+def cmd_bulk_status(tracker, args):
+    new_status = args.to.name
+    return sum(1 for task_id in selected_task_ids(tracker, args) if tracker.change_task_status(task_id, new_status))
+
+
+def cmd_bulk_progress(tracker, args):
+    return sum(1 for task_id in selected_task_ids(tracker, args) if tracker.update_task_progress(task_id, args.to))
+
+
+# Постраничный вывод: страница задается --limit/--offset, строки пишутся в stdout порциями.
+def cmd_list(tracker, args):
+    query = tracker.query()
+    if args.status:
+        query = query.status(*args.status)
+    if args.assignee:
+        query = query.assignee(args.assignee)
+    if args.due_from or args.due_to:
+        query = query.due_between(args.due_from, args.due_to)
+    if args.min_progress is not None or args.max_progress is not None:
+        query = query.progress_between(args.min_progress, args.max_progress)
+    query = query.order_by(args.sort, reverse=args.desc).offset(args.offset).limit(args.limit)
+    return tracker.print_tasks(query, page_size=0)
+
+
+def cmd_search(tracker, args):
+    tracker.display_search_results(' '.join(args.query), args.limit)
+    return 1
+
+
+def cmd_analytics(tracker, args):
+    result = tracker.analytics_report(args.period)
+    return result['total'] if result is not None else 0
+
+
+def cmd_migrate(config):
+    from sqlite_storage import SqliteStorage
+    storage = SqliteStorage(config)
+    tasks_count, users_count = storage.import_json(config['tasks_file'], config.get('users_file', 'users.json'))
+    print(f"Перенесено задач: {tasks_count}, пользователей: {users_count} в {storage.database_file}.")
+
+
+def cmd_stats(config):
+    path = config.get('stats_file', 'task_stats.json')
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            print(json.dumps(json.load(file), indent=4, ensure_ascii=False))
+    except FileNotFoundError:
+        print(f"Статистика не найдена: {path}. Включите \"instrumentation\": true в config.json.")
+        return 1
+    return 0
+
+
+# Код, который выполняется в отдельном процессе для замера холодного старта:
+# импорт модулей приложения и создание трекера с загрузкой задач и пользователей.
+STARTUP_PROBE = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+tracker = main.TaskTracker.TaskTracker(main.load_config())
+ready = time.perf_counter()
+print(json.dumps({'import_ms': (imported - start) * 1e3, 'init_ms': (ready - imported) * 1e3,
+                  'tasks': len(tracker.tasks)}))
+"""
+
+
+def cmd_startup_time(config, runs, budget_ms):
+    budget_ms = budget_ms or config.get('startup_budget_ms', 1000)
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    totals = []
+    for run in range(1, runs + 1):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-c', STARTUP_PROBE], capture_output=True, text=True, env=env)
+        total_ms = (time.perf_counter() - start) * 1e3
+        if completed.returncode != 0:
+            print(completed.stderr)
+            return 1
+        probe = json.loads(completed.stdout.strip().splitlines()[-1])
+        totals.append(total_ms)
+        print(f"Запуск {run}: всего {total_ms:.0f} мс (импорт {probe['import_ms']:.0f} мс, "
+              f"загрузка {probe['init_ms']:.0f} мс, задач: {probe['tasks']})")
+    median = statistics.median(totals)
+    print(f"Медиана: {median:.0f} мс, бюджет: {budget_ms} мс")
+    if median > budget_ms:
+        print("Время запуска превышает бюджет.")
+        return 1
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Пакетные операции с задачами.")
+    parser.add_argument('--user', default=os.environ.get('TASK_TRACKER_USER'), help="имя пользователя")
+    parser.add_argument('--password', default=os.environ.get('TASK_TRACKER_PASSWORD'), help="пароль")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('import', help="добавить задачи из файла .json или .ndjson")
+    command.add_argument('file')
+    command.add_argument('--upsert', action='store_true', help="заменять задачи с совпадающим ID")
+    command.set_defaults(handler=cmd_import, admin_only=True)
+
+    command = commands.add_parser('delete', help="удалить задачи по ID")
+    command.add_argument('ids', nargs='+', type=int)
+    command.set_defaults(handler=cmd_delete, admin_only=True)
+
+    for name, handler, to_type, help_text in (
+            ('bulk-status', cmd_bulk_status, status_value, "изменить статус выбранных задач"),
+            ('bulk-progress', cmd_bulk_progress, progress_value, "изменить прогресс выбранных задач")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('--to', required=True, type=to_type, help="новое значение")
+        command.add_argument('--assignee', help="только задачи этого исполнителя")
+        command.add_argument('--status', type=status_value, help="только задачи с этим статусом")
+        command.add_argument('--ids', nargs='+', type=int, help="только задачи с этими ID")
+        command.set_defaults(handler=handler, admin_only=False)
+
+    command = commands.add_parser('list', help="вывести задачи с фильтрами, сортировкой и постранично")
+    command.add_argument('--status', nargs='+', type=status_value, help="статусы задач")
+    command.add_argument('--assignee', help="исполнитель")
+    command.add_argument('--due-from', type=datetime.date.fromisoformat, help="срок не раньше (YYYY-MM-DD)")
+    command.add_argument('--due-to', type=datetime.date.fromisoformat, help="срок не позже (YYYY-MM-DD)")
+    command.add_argument('--min-progress', type=int, help="прогресс не меньше")
+    command.add_argument('--max-progress', type=int, help="прогресс не больше")
+    command.add_argument('--sort', default='id', choices=sorted(SORT_KEYS), help="поле сортировки")
+    command.add_argument('--desc', action='store_true', help="по убыванию")
+    command.add_argument('--limit', type=int, default=100, help="задач на странице")
+    command.add_argument('--offset', type=int, default=0, help="пропустить задач")
+    command.set_defaults(handler=cmd_list, admin_only=False)
+
+    command = commands.add_parser('search', help="найти задачи по словам из названия и описания")
+    command.add_argument('query', nargs='+', help="слова запроса (каждое может быть началом слова)")
+    command.add_argument('--limit', type=int, default=20, help="максимум результатов")
+    command.set_defaults(handler=cmd_search, admin_only=False)
+
+    command = commands.add_parser('analytics', help="распределение прогресса и burndown по срокам (нужен numpy)")
+    command.add_argument('--period', type=int, default=7, help="длина периода burndown в днях")
+    command.set_defaults(handler=cmd_analytics, admin_only=False)
+
+    command = commands.add_parser('migrate', help="перенести tasks.json и users.json в базу SQLite")
+    command.set_defaults(handler=None)
+
+    command = commands.add_parser('startup-time', help="измерить время холодного старта приложения")
+    command.add_argument('--runs', type=int, default=5, help="количество запусков")
+    command.add_argument('--budget-ms', type=float, help="допустимое время запуска (startup_budget_ms)")
+    command.set_defaults(handler=None)
+
+    command = commands.add_parser('serve', help="запустить HTTP/JSON API на localhost")
+    command.add_argument('--host', default='127.0.0.1')
+    command.add_argument('--port', type=int, default=8080)
+    command.set_defaults(handler=None)
+
+    command = commands.add_parser('stats', help="вывести собранную статистику производительности (JSON)")
+    command.set_defaults(handler=None)
+    return parser
+
+
+def main(argv, config):
+    args = build_parser().parse_args(argv)
+    if args.command == 'migrate':
+        cmd_migrate(config)
+        return 0
+    if args.command == 'stats':
+        return cmd_stats(config)
+    if args.command == 'startup-time':
+        return cmd_startup_time(config, args.runs, args.budget_ms)
+    if args.command == 'serve':
+        import server
+        server.run(TaskTracker.TaskTracker(config), args.host, args.port)
+        return 0
+
+    tracker = TaskTracker.TaskTracker(config)
+    user = tracker.authenticate(args.user, args.password)
+    if user is None:
+        print("Неверное имя пользователя или пароль.")
+        return 1
+    if args.admin_only and user.role != 'admin':
+        print("У вас нет прав для этой операции.")
+        return 1
+    tracker.current_user = user
+
+    start = time.perf_counter()
+    try:
+        with tracker.batch():
+            count = args.handler(tracker, args)
+    except (OSError, ValueError) as error:
+        print(f"Команда прервана, изменения не сохранены: {error}")
+        return 1
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0
+    print(f"Выполнено операций: {count} за {elapsed:.2f} с ({rate:.0f} оп/с).")
+    return 0
@@ -1,14 +1,22 @@
 import logging
-from functools import lru_cache
+from collections import OrderedDict
+from functools import wraps
 
 # Настройка логирования
 logging.basicConfig(level=logging.INFO)
 
+# Аргументы и результат форматируются только при включенном уровне DEBUG,
+# иначе обертка стоит одну проверку уровня. Время выполнения собирает модуль instrumentation.
 def log_function_call(func):
+    logger = logging.getLogger(func.__module__)
+
+    @wraps(func)
     def wrapper(*args, **kwargs):
-        logging.info(f"Вызов функции {func.__name__} с аргументами {args} и {kwargs}")
+        if not logger.isEnabledFor(logging.DEBUG):
+            return func(*args, **kwargs)
+        logger.debug("Вызов функции %s с аргументами %r и %r", func.__name__, args, kwargs)
         result = func(*args, **kwargs)
-        logging.info(f"Функция {func.__name__} вернула {result}")
+        logger.debug("Функция %s вернула %r", func.__name__, result)
         return result
     return wrapper
 
@@ -21,8 +29,68 @@ def handle_exceptions(func):
             return None
     return wrapper
 
-def cache_results(func):
-    @lru_cache(maxsize=None)
-    def wrapper(*args, **kwargs):
-        return func(*args, **kwargs)
+# Кэш результатов запросов к трекеру с вытеснением давно не использованных записей (LRU).
+# Кэш сбрасывается целиком, когда меняется версия данных трекера (data_version),
+# которую увеличивает каждое изменение задач.
+class QueryCache:
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.version = None
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, version):
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            self.version = version
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations
+        }
+
+
+# Кэширование метода трекера в tracker.query_cache. Ключ - имя метода, текущий
+# пользователь и аргументы; результат должен быть неизменяемым снимком (списком задач).
+def cached_query(method):
+    @wraps(method)
+    def wrapper(self, *args):
+        user = self.current_user.username if self.current_user is not None else None
+        key = (method.__name__, user, args)
+        try:
+            return self.query_cache.get(key, self.data_version)
+        except KeyError:
+            result = method(self, *args)
+            self.query_cache.put(key, result)
+            return result
     return wrapper
@@ -0,0 +1,113 @@
+#Сбор статистики производительности: число вызовов и гистограмма времени выполнения
+# для методов TaskTracker и хранилищ, байты, прочитанные и записанные на диск,
+# и попадания/промахи кэшей (например, кэша запросов трекера).
+# Включается "instrumentation": true в config.json или переменной окружения
+# TASK_TRACKER_STATS=1. В выключенном состоянии методы не оборачиваются вовсе,
+# а счетчики байтов сводятся к одной проверке флага на операцию с файлом.
+# При выходе статистика записывается в JSON-файл stats_file (по умолчанию task_stats.json),
+# вывести ее можно командой: python main.py stats
+import atexit
+import json
+import os
+import time
+from functools import wraps
+
+TRACKER_METHODS = (
+    'add_task', 'remove_task', 'change_task_status', 'update_task_progress',
+    'display_tasks', 'display_tasks_by_status', 'display_tasks_by_assignee', 'display_task_deadlines',
+    'notify_user', 'promote_overdue', 'generate_report', 'login', 'register_user',
+    'load_tasks', 'save_tasks', 'load_users', 'save_users'
+)
+STORAGE_METHODS = ('open_store', 'append', 'save_tasks', 'load_users', 'save_users')
+HISTOGRAM_BUCKETS = 48
+
+
+class Stats:
+    def __init__(self):
+        self.enabled = False
+        self.methods = {}
+        self.io = {}
+        self.caches = {}
+
+    # Время в наносекундах попадает в корзину k, если оно меньше 2**k нс.
+    def observe(self, name, elapsed_ns):
+        entry = self.methods.get(name)
+        if entry is None:
+            entry = self.methods[name] = {'calls': 0, 'total_ns': 0, 'max_ns': 0, 'buckets': [0] * HISTOGRAM_BUCKETS}
+        entry['calls'] += 1
+        entry['total_ns'] += elapsed_ns
+        if elapsed_ns > entry['max_ns']:
+            entry['max_ns'] = elapsed_ns
+        entry['buckets'][min(elapsed_ns.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def add_bytes(self, name, read=0, written=0):
+        entry = self.io.setdefault(name, {'bytes_read': 0, 'bytes_written': 0})
+        entry['bytes_read'] += read
+        entry['bytes_written'] += written
+
+    def to_dict(self):
+        methods = {}
+        for name, entry in sorted(self.methods.items()):
+            methods[name] = {
+                'calls': entry['calls'],
+                'total_ms': entry['total_ns'] / 1e6,
+                'mean_us': entry['total_ns'] / entry['calls'] / 1e3,
+                'max_us': entry['max_ns'] / 1e3,
+                'histogram_ns': {f"<{2 ** k}": count for k, count in enumerate(entry['buckets']) if count}
+            }
+        return {'methods': methods, 'io': dict(sorted(self.io.items())),
+                'caches': {name: cache.stats() for name, cache in sorted(self.caches.items())}}
+
+
+STATS = Stats()
+
+
+def add_bytes(name, read=0, written=0):
+    if STATS.enabled:
+        STATS.add_bytes(name, read, written)
+
+
+# Кэш с методом stats(); его счетчики попадают в статистику при выходе.
+def register_cache(name, cache):
+    if STATS.enabled:
+        STATS.caches[name] = cache
+
+
+def _timed(name, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            STATS.observe(name, time.perf_counter_ns() - start)
+    wrapper.instrumented = True
+    return wrapper
+
+
+def instrument(cls, names, prefix=None):
+    prefix = prefix or cls.__name__
+    for name in names:
+        func = cls.__dict__.get(name)
+        if func is not None and not getattr(func, 'instrumented', False):
+            setattr(cls, name, _timed(f"{prefix}.{name}", func))
+
+
+def enabled_in(config):
+    return bool(config.get('instrumentation')) or os.environ.get('TASK_TRACKER_STATS') == '1'
+
+
+def dump(path):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(STATS.to_dict(), file, indent=4)
+
+
+# Включение сбора статистики: оборачиваются методы трекера и всех классов хранилищ.
+def enable(config, tracker_cls, storage_classes):
+    if STATS.enabled:
+        return
+    STATS.enabled = True
+    instrument(tracker_cls, TRACKER_METHODS)
+    for storage_cls in storage_classes:
+        instrument(storage_cls, STORAGE_METHODS)
+    atexit.register(dump, config.get('stats_file', 'task_stats.json'))
@@ -5,21 +5,12 @@ import project_4 #файл содержит функцию для отображ
 import project_5 #файл содержит функцию для отображения задач по статусу
 import project_6 #айл содержит функцию для отображения сроков выполнения задач
 import project_7 #файл содержит функцию для завершения работы приложения
+import project_8 #файл содержит функции для поиска и редактирования задач
 
 
 import TaskTracker
 import json
-import project_1 #файл содержит функции для добавления задач и просмотра задач по исполнителю.
-import project_2 #файл содержит функцию для удаления задач
-import project_3 #файл содержит функцию для изменения статуса задач
-import project_4 #файл содержит функцию для отображения всех задач
-import project_5 #файл содержит функцию для отображения задач по статусу
-import project_6 #айл содержит функцию для отображения сроков выполнения задач
-import project_7 #файл содержит функцию для завершения работы приложения
-
-
-import TaskTracker
-import json
+import sys
 
 def load_config():
     with open('config.json', 'r') as file:
@@ -46,6 +37,7 @@ def main():
             password = input("Введите пароль: ")
             if tracker.login(username, password):
                 while True:
+                    tracker.promote_overdue()
                     print("\nМеню:")
                     print("1. Добавить задачу")
                     print("2. Удалить задачу")
@@ -56,7 +48,9 @@ def main():
                     print("7. Показать/скрыть выполненные задания")
                     print("8. Посмотреть задачи по исполнителю")
                     print("9. Меню отчетов")
-                    print("10. Завершить работу")
+                    print("10. Поиск задач")
+                    print("11. Редактировать задачу")
+                    print("12. Завершить работу")
 
                     choice = input("Выберите действие: ")
 
@@ -97,10 +91,17 @@ def main():
                         project_4.report_menu(tracker)
 
                     elif choice == "10":
+                        project_8.search_tasks(tracker)
+
+                    elif choice == "11":
+                        project_8.edit_task(tracker)
+                        tracker.save_tasks()
+
+                    elif choice == "12":
                         project_7.app_exit()
                         break
                     else:
-                        print("Неверный выбор. Пожалуйста, выберите опцию от 1 до 10.")
+                        print("Неверный выбор. Пожалуйста, выберите опцию от 1 до 12.")
 
         elif choice == "2":
             username = input("Введите имя пользователя: ")
@@ -115,4 +116,7 @@ def main():
             print("Неверный выбор. Пожалуйста, выберите опцию от 1 до 3.")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        import cli
+        sys.exit(cli.main(sys.argv[1:], load_config()))
     main()
@@ -3,7 +3,12 @@ def change_task_status(tracker):
     if not tracker.change_task_status(task_id, input("Введите новый статус задачи (OPEN, IN_PROGRESS, COMPLETED, OVERDUE): ")):
         return
     progress = input("Введите процент выполнения задачи (0-100): ")
-    if not tracker.update_task_progress(task_id, int(progress)):
+    try:
+        progress = int(progress)
+    except ValueError:
+        print("Прогресс должен быть целым числом от 0 до 100.")
+        return
+    if not tracker.update_task_progress(task_id, progress):
         return
     print("Статус задачи и прогресс выполнения изменены.")
 
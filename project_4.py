@@ -7,19 +7,28 @@ def view_all_tasks(tracker):
     tracker.display_tasks(show_completed)
 
 def generate_report(tracker):
-    tracker.generate_report()
+    report_format = input("Формат отчета (grid, csv, ndjson) [grid]: ").strip().lower() or 'grid'
+    if report_format not in ('grid', 'csv', 'ndjson'):
+        print("Неизвестный формат отчета.")
+        return
+    status = input("Статус задач (OPEN, IN_PROGRESS, COMPLETED, OVERDUE) или Enter для всех: ").strip() or None
+    assignee = input("Исполнитель или Enter для всех: ").strip() or None
+    tracker.generate_report(report_format, status, assignee)
 
 def report_menu(tracker):
     while True:
         print("\nМеню отчетов:")
         print("1. Сгенерировать отчет по задачам")
-        print("2. Вернуться в главное меню")
+        print("2. Аналитика: распределение прогресса и burndown")
+        print("3. Вернуться в главное меню")
 
         choice = input("Выберите действие: ")
 
         if choice == "1":
             generate_report(tracker)
         elif choice == "2":
+            tracker.analytics_report()
+        elif choice == "3":
             break
         else:
-            print("Неверный выбор. Пожалуйста, выберите опцию от 1 до 2.")
+            print("Неверный выбор. Пожалуйста, выберите опцию от 1 до 3.")
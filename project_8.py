@@ -0,0 +1,17 @@
+#файл содержит функции для поиска и редактирования задач
+#Поиск запрашивает слова (можно начало слова) и показывает найденные задачи
+# в порядке релевантности; редактирование меняет название и описание задачи.
+
+def search_tasks(tracker):
+    query = input("Введите слова для поиска: ")
+    tracker.display_search_results(query)
+
+def edit_task(tracker):
+    task_id = input("Введите ID задачи для редактирования: ")
+    title = input("Введите новое название задачи (Enter - оставить прежнее): ") or None
+    description = input("Введите новое описание задачи (Enter - оставить прежнее): ") or None
+    result = tracker.edit_task(task_id, title, description)
+    if result is None:
+        print("Задача не найдена.")
+    elif result:
+        print("Задача изменена.")
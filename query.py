@@ -0,0 +1,142 @@
+#Составной ленивый запрос к хранилищу задач.
+# Query(store) описывает фильтры (статусы, исполнитель, диапазон сроков, диапазон прогресса),
+# ограничение видимости для пользователя, сортировку и limit/offset; каждый метод возвращает
+# новый запрос, а задачи выбираются только при переборе (генератором).
+# Источник задач выбирается по самому узкому индексу хранилища: исполнитель, затем статусы,
+# затем диапазон сроков; если порядок источника совпадает с нужной сортировкой, задачи
+# не сортируются и перебор останавливается после limit результатов.
+import copy
+import datetime
+import heapq
+from itertools import islice
+from operator import attrgetter
+
+from task_store import due_ordinal, in_range
+
+SORT_KEYS = {
+    'id': attrgetter('id'),
+    'due_date': lambda task: (due_ordinal(task.due_date), task.id),
+    'progress': lambda task: (task.progress, task.id),
+    'title': lambda task: (task.title.casefold(), task.id),
+    'status': lambda task: (task.status.name, task.id),
+}
+
+
+def parse_date(value):
+    if value is None or isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(value)
+
+
+class Query:
+    def __init__(self, store):
+        self.store = store
+        self._statuses = None
+        self._assignee = None
+        self._visible = None
+        self._due = (None, None)
+        self._progress = (None, None)
+        self._order = 'id'
+        self._reverse = False
+        self._offset = 0
+        self._limit = None
+
+    def _with(self, **changes):
+        query = copy.copy(self)
+        for name, value in changes.items():
+            setattr(query, '_' + name, value)
+        return query
+
+    def status(self, *statuses):
+        return self._with(statuses=tuple(statuses))
+
+    def assignee(self, assignee):
+        return self._with(assignee=assignee)
+
+    # Только задачи, доступные пользователю: администратору все, остальным свои.
+    def visible_to(self, user):
+        return self._with(visible=None if user.role == 'admin' else user.username)
+
+    def due_between(self, start=None, end=None):
+        return self._with(due=(parse_date(start), parse_date(end)))
+
+    def progress_between(self, low=None, high=None):
+        return self._with(progress=(low, high))
+
+    def order_by(self, key, reverse=False):
+        if key not in SORT_KEYS:
+            raise ValueError(f"Неизвестное поле сортировки: {key}")
+        return self._with(order=key, reverse=reverse)
+
+    def offset(self, offset):
+        return self._with(offset=offset)
+
+    def limit(self, limit):
+        return self._with(limit=limit)
+
+    # Исполнитель с учетом видимости; False, если запрошен чужой исполнитель.
+    def _effective_assignee(self):
+        if self._visible is None:
+            return self._assignee
+        if self._assignee is not None and self._assignee != self._visible:
+            return False
+        return self._visible
+
+    # Источник задач и признак того, что он уже упорядочен нужным образом.
+    def _source(self, assignee):
+        start, end = self._due
+        statuses = list(self._statuses) if self._statuses is not None else None
+        has_due_range = start is not None or end is not None
+        if assignee is None and statuses is None and (has_due_range or self._order == 'due_date'):
+            return self.store.by_deadline(start=start, end=end), self._order == 'due_date'
+        if assignee is not None and statuses is None and self._order == 'due_date':
+            return self.store.by_deadline(assignee=assignee, start=start, end=end), True
+        if assignee is None and statuses is None:
+            if self._order == 'id':
+                return self.store.find(), True
+            return iter(self.store), False
+        return self.store.find(assignee=assignee, statuses=statuses), self._order == 'id'
+
+    # Проверка условий, которые не учтены источником (статусы всегда отбирает store.find);
+    # None, если проверять нечего.
+    def _matches(self):
+        start, end = self._due
+        low_due = start.toordinal() if start is not None else None
+        high_due = end.toordinal() if end is not None else None
+        check_due = low_due is not None or high_due is not None
+        low, high = self._progress
+        if not check_due and low is None and high is None:
+            return None
+
+        def matches(task):
+            if check_due and not in_range(due_ordinal(task.due_date), low_due, high_due):
+                return False
+            if low is not None and task.progress < low:
+                return False
+            return high is None or task.progress <= high
+        return matches
+
+    def __iter__(self):
+        assignee = self._effective_assignee()
+        if assignee is False:
+            return iter(())
+        tasks, ordered = self._source(assignee)
+        matches = self._matches()
+        if matches is not None:
+            tasks = filter(matches, tasks)
+        end = None if self._limit is None else self._offset + self._limit
+        if not ordered or self._reverse:
+            key = SORT_KEYS[self._order]
+            if end is None:
+                tasks = sorted(tasks, key=key, reverse=self._reverse)
+            elif self._reverse:
+                tasks = heapq.nlargest(end, tasks, key=key)
+            else:
+                tasks = heapq.nsmallest(end, tasks, key=key)
+        return islice(tasks, self._offset, end)
+
+    def count(self):
+        return sum(1 for _ in self)
+
+    def first(self):
+        return next(iter(self.limit(1)), None)
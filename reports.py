@@ -0,0 +1,94 @@
+#Потоковая выгрузка отчета по задачам в форматах grid (таблица), csv и ndjson.
+# Строки пишутся в файл порциями по chunk_size, поэтому память не зависит от числа задач.
+# Для таблицы нужны ширины столбцов, они считаются отдельным первым проходом по задачам.
+import csv
+import json
+
+HEADERS = ["ID", "Title", "Description", "Status", "Due Date", "Assignee", "Progress"]
+REPORT_FORMATS = ('grid', 'csv', 'ndjson')
+REPORT_FILES = {'grid': 'task_report.txt', 'csv': 'task_report.csv', 'ndjson': 'task_report.ndjson'}
+
+
+def report_row(task):
+    return [task.id, task.title, task.description, task.status.value, task.due_date, task.assignee, f"{task.progress}%"]
+
+
+def _cell(value):
+    return "" if value is None else str(value)
+
+
+def _cell_lines(value):
+    return _cell(value).splitlines() or [""]
+
+
+# Строка таблицы в стиле tabulate(tablefmt="grid"): ID выравнивается вправо, остальное влево.
+# Многострочная ячейка занимает несколько физических строк, по числу строк в самой высокой ячейке.
+def _grid_line(cells, widths):
+    columns = [_cell_lines(cell) for cell in cells]
+    height = max(len(lines) for lines in columns)
+    rows = []
+    for row in range(height):
+        parts = [(lines[row] if row < len(lines) else "").ljust(width) for lines, width in zip(columns, widths)]
+        parts[0] = (columns[0][row] if row < len(columns[0]) else "").rjust(widths[0])
+        rows.append("| " + " | ".join(parts) + " |")
+    return "\n".join(rows)
+
+
+def _grid_lines(tasks):
+    # Как в tabulate: столбец не уже заголовка плюс два символа.
+    widths = [len(header) + 2 for header in HEADERS]
+    for task in tasks():
+        for i, cell in enumerate(report_row(task)):
+            widths[i] = max(widths[i], max(len(line) for line in _cell_lines(cell)))
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+    yield border
+    yield _grid_line(HEADERS, widths)
+    yield border.replace("-", "=")
+    for task in tasks():
+        yield _grid_line(report_row(task), widths)
+        yield border
+
+
+# tasks - функция, возвращающая новый итератор по задачам (для таблицы он нужен дважды).
+# Возвращает количество задач в отчете.
+def write_report(path, tasks, report_format='grid', echo=False, chunk_size=1000):
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(f"Неизвестный формат отчета: {report_format}")
+    count = 0
+
+    def counted_tasks():
+        nonlocal count
+        count = 0
+        for task in tasks():
+            count += 1
+            yield task
+
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        if report_format == 'csv':
+            writer = csv.writer(file)
+            records = (report_row(task) for task in counted_tasks())
+            write = writer.writerows
+            writer.writerow(HEADERS)
+        else:
+            if report_format == 'ndjson':
+                records = (json.dumps(task.to_dict(), ensure_ascii=False) for task in counted_tasks())
+            else:
+                records = _grid_lines(counted_tasks)
+
+            def write(chunk):
+                text = "\n".join(chunk) + "\n"
+                file.write(text)
+                if echo:
+                    print(text, end="")
+
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                write(chunk)
+                chunk = []
+                if not echo:
+                    print(f"Записано задач: {count}")
+        if chunk:
+            write(chunk)
+    return count
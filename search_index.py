@@ -0,0 +1,192 @@
+#Полнотекстовый поиск по названию и описанию задач (инвертированный индекс).
+# Текст разбивается на слова (\w+, кириллица и латиница), приводится к нижнему регистру,
+# буква "ё" заменяется на "е". Для каждого слова хранится словарь id -> вес, где слово
+# в названии весит TITLE_WEIGHT, а в описании 1. Каждое слово запроса ищется как префикс
+# по отсортированному словарю слов (bisect); задача должна содержать все слова запроса.
+# Оценка: вес * idf, точное совпадение слова ценится выше совпадения по префиксу.
+# Индекс хранится рядом с задачами: снимок (pickle) и журнал изменений текста задач
+# <файл>.log (NDJSON). При изменении задач в журнал дописываются только измененные задачи,
+# сам индекс для этого не загружается. При загрузке журнал применяется к снимку, и по
+# отпечатку текста задач (количество и сумма crc32) проверяется, что индекс соответствует
+# задачам; если журнал стал длинным, он сворачивается в новый снимок.
+import heapq
+import json
+import math
+import os
+import re
+import zlib
+from bisect import bisect_left
+
+from storage import SnapshotCache
+
+WORD = re.compile(r'\w+')
+TITLE_WEIGHT = 3
+PREFIX_FACTOR = 0.5
+FINGERPRINT_MASK = 2 ** 64 - 1
+INDEX_FORMAT = ('search_index', 1)
+# Журнал сворачивается в снимок, когда в нем больше записей, чем это число
+# и чем десятая часть проиндексированных задач.
+COMPACT_MIN_RECORDS = 1000
+
+
+def tokenize(text):
+    return WORD.findall((text or '').casefold().replace('ё', 'е'))
+
+
+def text_checksum(task_id, title, description):
+    return zlib.crc32(f"{task_id}\0{title}\0{description}".encode('utf-8'))
+
+
+# Запись журнала индекса о добавлении или изменении текста задачи.
+def text_record(task):
+    return {'op': 'add', 'id': task.id, 'title': task.title, 'description': task.description}
+
+
+def append_log(path, records):
+    with open(path + '.log', 'a', encoding='utf-8') as file:
+        file.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+
+
+def text_fingerprint(tasks):
+    count = 0
+    total = 0
+    for task in tasks:
+        count += 1
+        total += text_checksum(task.id, task.title, task.description)
+    return count, total & FINGERPRINT_MASK
+
+
+class SearchIndex:
+    def __init__(self, tasks=()):
+        self._postings = {}
+        self._task_words = {}
+        self._vocabulary = []
+        self._vocabulary_sorted = True
+        self._checksum = 0
+        self.log_records = 0
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self):
+        return len(self._task_words)
+
+    def fingerprint(self):
+        return len(self._task_words), self._checksum
+
+    def add(self, task):
+        self.add_text(task.id, task.title, task.description)
+
+    def add_text(self, task_id, title, description):
+        if task_id in self._task_words:
+            self.remove(task_id)
+        weights = {}
+        for word in tokenize(title):
+            weights[word] = weights.get(word, 0) + TITLE_WEIGHT
+        for word in tokenize(description):
+            weights[word] = weights.get(word, 0) + 1
+        for word, weight in weights.items():
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = {}
+                self._vocabulary_sorted = False
+            postings[task_id] = weight
+        checksum = text_checksum(task_id, title, description)
+        self._task_words[task_id] = (tuple(weights), checksum)
+        self._checksum = (self._checksum + checksum) & FINGERPRINT_MASK
+
+    def remove(self, task_id):
+        entry = self._task_words.pop(task_id, None)
+        if entry is None:
+            return
+        words, checksum = entry
+        for word in words:
+            postings = self._postings[word]
+            del postings[task_id]
+            if not postings:
+                del self._postings[word]
+                self._vocabulary_sorted = False
+        self._checksum = (self._checksum - checksum) & FINGERPRINT_MASK
+
+    # Применение записи журнала индекса (text_record или {'op': 'remove', 'id': ...}).
+    def apply(self, record):
+        if record['op'] == 'add':
+            self.add_text(record['id'], record['title'], record['description'])
+        else:
+            self.remove(record['id'])
+
+    # Слова словаря, начинающиеся с prefix.
+    def expand(self, prefix):
+        if not self._vocabulary_sorted:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_sorted = True
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, prefix)
+        end = start
+        while end < len(vocabulary) and vocabulary[end].startswith(prefix):
+            end += 1
+        return vocabulary[start:end]
+
+    # Пары (оценка, id) по убыванию оценки; при равной оценке меньший id раньше.
+    # allowed - необязательная проверка id (например, права доступа).
+    def search(self, query, limit=None, allowed=None):
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        total = len(self._task_words)
+        scores = None
+        # Сначала обрабатываются самые редкие слова, чтобы множество кандидатов было меньше.
+        expanded = sorted(((term, self.expand(term)) for term in terms),
+                          key=lambda item: sum(len(self._postings[word]) for word in item[1]))
+        for term, words in expanded:
+            term_scores = {}
+            for word in words:
+                postings = self._postings[word]
+                weight = math.log(1 + total / len(postings)) * (1 if word == term else PREFIX_FACTOR)
+                candidates = postings if scores is None else (task_id for task_id in scores if task_id in postings)
+                for task_id in candidates:
+                    score = postings[task_id] * weight
+                    if score > term_scores.get(task_id, 0):
+                        term_scores[task_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {task_id: scores[task_id] + score for task_id, score in term_scores.items()}
+            if not scores:
+                return []
+        results = ((-score, task_id) for task_id, score in scores.items() if allowed is None or allowed(task_id))
+        results = sorted(results) if limit is None else heapq.nsmallest(limit, results)
+        return [(-score, task_id) for score, task_id in results]
+
+    # Индекс из снимка и журнала с примененными еще не записанными изменениями pending,
+    # если он соответствует задачам tasks; иначе None.
+    @classmethod
+    def load(cls, path, tasks, pending=()):
+        index = SnapshotCache(path, ()).load(INDEX_FORMAT)
+        if not isinstance(index, cls):
+            return None
+        try:
+            with open(path + '.log', 'r', encoding='utf-8') as file:
+                for line in file:
+                    index.apply(json.loads(line))
+                    index.log_records += 1
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError):
+            return None
+        for record in pending:
+            index.apply(record)
+        if index.fingerprint() != text_fingerprint(tasks):
+            return None
+        return index
+
+    def needs_compaction(self):
+        return self.log_records > max(COMPACT_MIN_RECORDS, len(self) // 10)
+
+    # Новый снимок индекса; журнал после этого не нужен.
+    def save(self, path):
+        self.log_records = 0
+        SnapshotCache(path, ()).save(INDEX_FORMAT, self)
+        try:
+            os.remove(path + '.log')
+        except FileNotFoundError:
+            pass
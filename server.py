@@ -0,0 +1,275 @@
+#HTTP/JSON API поверх общего TaskTracker на asyncio (без сторонних зависимостей).
+# Запуск: python main.py serve [--host 127.0.0.1] [--port 8080]
+# Каждый запрос проходит Basic-аутентификацию по пользователям трекера и выполняется
+# от имени этого пользователя с теми же правами, что и в меню. Изменения копятся
+# в пакете трекера и сохраняются не чаще раза в server_flush_interval секунд,
+# поэтому серия записей не вызывает save_tasks на каждый запрос.
+#
+#   GET    /tasks?status=OPEN&assignee=Olga&show_completed=1   список задач
+#   POST   /tasks              {"title", "description", "due_date", "assignee"}   (admin)
+#   DELETE /tasks/<id>                                                             (admin)
+#   POST   /tasks/<id>/status   {"status": "IN_PROGRESS"}
+#   POST   /tasks/<id>/progress {"progress": 50}
+#   GET    /search?q=отчет&limit=20   полнотекстовый поиск по названию и описанию
+#   GET    /report?status=&assignee=    отчет в формате NDJSON, передается порциями
+import asyncio
+import base64
+import binascii
+import json
+import traceback
+from urllib.parse import parse_qs, urlsplit
+
+from Task import Task, TaskStatus, is_valid_progress
+
+REASONS = {200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 401: "Unauthorized",
+           403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+MAX_BODY_SIZE = 1024 * 1024
+REPORT_CHUNK_SIZE = 1000
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# Строковое поле тела запроса; default, если поле не передано.
+def text_field(data, name, default=None):
+    value = data.get(name, default)
+    if value is not default and not isinstance(value, str):
+        raise HttpError(400, f"Поле {name} должно быть строкой")
+    return value
+
+
+def parse_status(name):
+    try:
+        return TaskStatus[name.replace(" ", "_").upper()]
+    except KeyError:
+        raise HttpError(400, f"Неизвестный статус: {name}")
+
+
+class TaskServer:
+    def __init__(self, tracker, flush_interval=1.0):
+        self.tracker = tracker
+        self.flush_interval = flush_interval
+        self.lock = asyncio.Lock()
+
+    async def serve(self, host, port):
+        self.tracker.begin_batch()
+        flusher = asyncio.create_task(self._flush_periodically())
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        print(f"Сервер запущен на http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            flusher.cancel()
+            self.tracker.commit_batch()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            async with self.lock:
+                # Ошибка записи (например, OSError) не должна останавливать сохранение:
+                # несохраненные изменения остаются в пакете до следующей попытки.
+                try:
+                    self.tracker.promote_overdue()
+                    self.tracker.commit_batch()
+                except Exception:
+                    traceback.print_exc()
+                finally:
+                    self.tracker.begin_batch()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as error:
+                    self._respond(writer, error.status, {'error': str(error)}, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                try:
+                    await self._dispatch(writer, method, target, headers, body, keep_alive)
+                except HttpError as error:
+                    self._respond(writer, error.status, {'error': str(error)}, keep_alive)
+                except Exception:
+                    # Ошибка в обработчике не должна обрывать соединение без ответа.
+                    traceback.print_exc()
+                    self._respond(writer, 500, {'error': "Внутренняя ошибка сервера"}, keep_alive=False)
+                    await writer.drain()
+                    break
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        method, target, _ = line.decode('latin-1').split(' ', 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get('content-length', 0))
+        if length > MAX_BODY_SIZE:
+            raise HttpError(413, "Слишком большое тело запроса")
+        body = await reader.readexactly(length) if length else b''
+        return method, target, headers, body
+
+    def _respond(self, writer, status, payload=None, keep_alive=True):
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+
+    # Проверка пароля (PBKDF2) выполняется в пуле потоков без блокировки трекера, чтобы
+    # медленная проверка, особенно неверного пароля, не задерживала других клиентов.
+    async def _authenticate(self, headers):
+        scheme, _, credentials = headers.get('authorization', '').partition(' ')
+        if scheme.lower() != 'basic':
+            raise HttpError(401, "Требуется аутентификация")
+        try:
+            username, _, password = base64.b64decode(credentials).decode('utf-8').partition(':')
+        except (binascii.Error, UnicodeDecodeError):
+            raise HttpError(401, "Неверные учетные данные")
+        loop = asyncio.get_running_loop()
+        user = await loop.run_in_executor(None, self.tracker.authenticate, username, password)
+        if user is None:
+            raise HttpError(401, "Неверное имя пользователя или пароль")
+        return user
+
+    async def _dispatch(self, writer, method, target, headers, body, keep_alive):
+        url = urlsplit(target)
+        parts = [part for part in url.path.split('/') if part]
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            data = json.loads(body) if body else {}
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            data = None
+        if not isinstance(data, dict):
+            raise HttpError(400, "Тело запроса должно быть JSON-объектом")
+
+        if parts == ['report'] and method == 'GET':
+            await self._stream_report(writer, headers, query, keep_alive)
+            return
+        user = await self._authenticate(headers)
+        # Обработчики синхронные: пока один выполняется, другие запросы не меняют трекер.
+        async with self.lock:
+            self.tracker.current_user = user
+            try:
+                status, payload = self._route(method, parts, query, data)
+            finally:
+                self.tracker.current_user = None
+        self._respond(writer, status, payload, keep_alive)
+
+    def _route(self, method, parts, query, data):
+        tracker = self.tracker
+        if parts == ['tasks']:
+            if method == 'GET':
+                return 200, [task.to_dict() for task in self._list_tasks(query)]
+            if method == 'POST':
+                self._require_admin()
+                title = text_field(data, 'title')
+                if title is None:
+                    raise HttpError(400, "Не указано название задачи")
+                task = Task(title, text_field(data, 'description', ''), TaskStatus.OPEN,
+                            text_field(data, 'due_date'), text_field(data, 'assignee'))
+                tracker.add_task(task)
+                return 201, task.to_dict()
+            raise HttpError(405, "Метод не поддерживается")
+
+        if parts == ['search'] and method == 'GET':
+            try:
+                limit = int(query.get('limit', 20))
+            except ValueError:
+                raise HttpError(400, "limit должен быть целым числом")
+            return 200, [task.to_dict() for task in tracker.search_tasks(query.get('q', ''), limit)]
+
+        if len(parts) >= 2 and parts[0] == 'tasks':
+            try:
+                task_id = int(parts[1])
+            except ValueError:
+                raise HttpError(404, "Задача не найдена")
+            if len(parts) == 2 and method == 'DELETE':
+                self._require_admin()
+                if task_id not in tracker.tasks:
+                    raise HttpError(404, "Задача не найдена")
+                tracker.remove_task(task_id)
+                return 204, None
+            if len(parts) == 3 and method == 'POST' and parts[2] in ('status', 'progress'):
+                if parts[2] == 'status':
+                    result = tracker.change_task_status(task_id, parse_status(text_field(data, 'status', '')).name)
+                else:
+                    progress = data.get('progress')
+                    if not is_valid_progress(progress):
+                        raise HttpError(400, "Прогресс должен быть целым числом от 0 до 100")
+                    result = tracker.update_task_progress(task_id, progress)
+                if result is None:
+                    raise HttpError(404, "Задача не найдена")
+                if not result:
+                    raise HttpError(403, "Нет прав для изменения этой задачи")
+                return 200, tracker.tasks.get(task_id).to_dict()
+        raise HttpError(404, "Ресурс не найден")
+
+    def _require_admin(self):
+        if self.tracker.current_user.role != 'admin':
+            raise HttpError(403, "Операция доступна только администратору")
+
+    # Без фильтра по статусу список, как и в меню, содержит только невыполненные задачи
+    # (или только выполненные при show_completed); all_statuses - все задачи.
+    def _list_tasks(self, query, all_statuses=False):
+        tracker = self.tracker
+        status = parse_status(query['status']) if 'status' in query else None
+        assignee = query.get('assignee')
+        if assignee is not None:
+            tasks = tracker.tasks_by_assignee(assignee)
+            return tuple(task for task in tasks if status is None or task.status == status)
+        if status is not None:
+            return tracker.tasks_by_status(status)
+        if all_statuses:
+            return tracker.visible_tasks(None)
+        return tracker.visible_tasks(query.get('show_completed') in ('1', 'true', 'да'))
+
+    # Отчет: под блокировкой берется только снимок ссылок на задачи, строки NDJSON
+    # отправляются порциями (chunked) уже без блокировки, чтобы не задерживать запись.
+    async def _stream_report(self, writer, headers, query, keep_alive):
+        user = await self._authenticate(headers)
+        async with self.lock:
+            self.tracker.current_user = user
+            try:
+                tasks = self._list_tasks(query, all_statuses=True)
+            finally:
+                self.tracker.current_user = None
+        head = ("HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson; charset=utf-8\r\n"
+                f"Transfer-Encoding: chunked\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1'))
+        for start in range(0, len(tasks), REPORT_CHUNK_SIZE):
+            chunk = "".join(json.dumps(task.to_dict(), ensure_ascii=False) + "\n"
+                            for task in tasks[start:start + REPORT_CHUNK_SIZE]).encode('utf-8')
+            writer.write(f"{len(chunk):x}\r\n".encode('latin-1') + chunk + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+
+
+def run(tracker, host='127.0.0.1', port=8080):
+    server = TaskServer(tracker, tracker.config.get('server_flush_interval', 1.0))
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        print("Сервер остановлен.")
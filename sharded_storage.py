@@ -0,0 +1,173 @@
+#Хранение задач в нескольких файлах-шардах ("storage_backend": "sharded").
+# Задача попадает в шард id % shard_count. Каждый шард - файл shard-N.ndjson в shard_dir:
+# первая строка {"version": V}, далее по задаче в строке. Доступ к шарду защищен
+# рекомендательной блокировкой файла shard-N.ndjson.lock, а номер версии позволяет
+# заметить, что шард успел изменить другой процесс (оптимистичная блокировка).
+# При сохранении перезаписываются только шарды, в которых были изменения; если версия
+# на диске новее загруженной, изменения этого процесса применяются поверх версии с диска.
+# Шарды при загрузке читаются параллельно пулом потоков или процессов (shard_pool).
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+
+from Task import Task
+from task_store import TaskStore
+from storage import JsonStorage, apply_record, write_atomic
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path, exclusive=True):
+    with open(path, 'a+b') as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_shard(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            header = file.readline()
+            if not header:
+                return 0, []
+            return json.loads(header)['version'], [json.loads(line) for line in file if line.strip()]
+    except FileNotFoundError:
+        return 0, []
+
+
+def _read_version(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            header = file.readline()
+    except FileNotFoundError:
+        return 0
+    return json.loads(header)['version'] if header else 0
+
+
+# Чтение шарда под разделяемой блокировкой; функция уровня модуля, чтобы работать в пуле процессов.
+def load_shard(path):
+    with file_lock(path + '.lock', exclusive=False):
+        return _read_shard(path)
+
+
+class ShardedStorage(JsonStorage):
+    def __init__(self, config):
+        super().__init__(config)
+        self.shard_dir = config.get('shard_dir', 'tasks_shards')
+        self.shard_count = config.get('shard_count', 8)
+        self.workers = config.get('shard_workers', min(self.shard_count, os.cpu_count() or 1))
+        self.pool = config.get('shard_pool', 'thread')
+        self._versions = [0] * self.shard_count
+        self._pending = {}
+        # True, если при последнем сохранении шарды сливались с изменениями другого процесса.
+        self.merged = False
+
+    def shard_path(self, shard):
+        return os.path.join(self.shard_dir, f"shard-{shard}.ndjson")
+
+    def shard_of(self, task_id):
+        return task_id % self.shard_count
+
+    def open_store(self):
+        if not os.path.isdir(self.shard_dir):
+            return self._split_tasks_file()
+        executor_cls = ProcessPoolExecutor if self.pool == 'process' else ThreadPoolExecutor
+        paths = [self.shard_path(shard) for shard in range(self.shard_count)]
+        with executor_cls(max_workers=self.workers) as executor:
+            shards = list(executor.map(load_shard, paths))
+        store = TaskStore()
+        for shard, (version, rows) in enumerate(shards):
+            self._versions[shard] = version
+            for data in rows:
+                store.add(Task.from_dict(data))
+        return store
+
+    # Первый запуск: задачи из tasks.json (если он есть) раскладываются по шардам.
+    def _split_tasks_file(self):
+        os.makedirs(self.shard_dir, exist_ok=True)
+        try:
+            store = super()._load_store()
+        except FileNotFoundError:
+            store = TaskStore()
+        self._pending = {shard: [] for shard in range(self.shard_count)}
+        self.save_tasks(store)
+        return store
+
+    # Изменения только запоминаются по шардам, запись происходит в save_tasks.
+    def append(self, records):
+        for record in records:
+            task_id = record['task']['id'] if record['op'] == 'add' else record['id']
+            self._pending.setdefault(self.shard_of(task_id), []).append(record)
+
+    def save_tasks(self, tasks):
+        self.merged = False
+        if not self._pending:
+            return
+        dirty = {shard: [] for shard in self._pending}
+        for task in tasks:
+            shard_tasks = dirty.get(self.shard_of(task.id))
+            if shard_tasks is not None:
+                shard_tasks.append(task)
+        for shard, shard_tasks in dirty.items():
+            self._save_shard(shard, shard_tasks, tasks)
+        self._pending = {}
+
+    def _save_shard(self, shard, shard_tasks, tasks):
+        path = self.shard_path(shard)
+        with file_lock(path + '.lock'):
+            version = _read_version(path)
+            if version != self._versions[shard]:
+                shard_tasks = self._merge_shard(shard, path, tasks)
+                version = max(version, self._versions[shard])
+            version += 1
+
+            def write(file):
+                file.write(json.dumps({'version': version}) + '\n')
+                for task in shard_tasks:
+                    file.write(json.dumps(task.to_dict()) + '\n')
+            write_atomic(path, write)
+            self._versions[shard] = version
+
+    # Шард изменен другим процессом: берется его версия с диска, поверх нее применяются
+    # изменения этого процесса, и общее хранилище задач обновляется результатом.
+    # Если новая задача этого процесса получила тот же ID, что и задача другого процесса,
+    # ей выдается следующий свободный ID из того же шарда.
+    def _merge_shard(self, shard, path, tasks):
+        self.merged = True
+        _, rows = _read_shard(path)
+        merged = TaskStore(Task.from_dict(data) for data in rows)
+        next_id = max([Task._id_counter] + [data['id'] + 1 for data in rows])
+        renamed = {}
+        for record in self._pending.get(shard, ()):
+            if record['op'] == 'add':
+                data = record['task']
+                if data['id'] in merged:
+                    new_id = next_id + (shard - next_id) % self.shard_count
+                    print(f"Задача {data['id']} добавлена другим процессом, новая задача получила ID {new_id}.")
+                    renamed[data['id']] = new_id
+                    next_id = new_id + 1
+                    record = dict(record, task=dict(data, id=new_id))
+            elif record['id'] in renamed:
+                record = dict(record, id=renamed[record['id']])
+            apply_record(merged, record)
+        for task_id in [task.id for task in tasks if self.shard_of(task.id) == shard]:
+            tasks.remove(task_id)
+        for task in merged:
+            tasks.add(task)
+        return list(merged)
@@ -0,0 +1,214 @@
+#Хранение задач и пользователей в локальной базе SQLite ("storage_backend": "sqlite").
+# Фильтры по статусу и исполнителю выполняются запросами к базе по индексам,
+# поэтому для вывода нескольких строк не нужно загружать все задачи в память.
+import json
+import sqlite3
+
+from Task import Task, TaskStatus
+from storage import iter_json_array
+from task_store import NO_DUE_DATE, due_ordinal
+
+ISO_DATE_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"
+# Срок задан существующей датой YYYY-MM-DD (как due_ordinal в TaskStore): GLOB отсекает
+# строки другого вида, функция is_due_date - несуществующие даты вроде 2025-13-45.
+HAS_DUE_DATE = f"(due_date GLOB '{ISO_DATE_GLOB}' AND is_due_date(due_date))"
+TASK_COLUMNS = "id, title, description, status, due_date, assignee, progress"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT,
+    status TEXT NOT NULL,
+    due_date TEXT,
+    assignee TEXT,
+    progress INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks (assignee);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    role TEXT NOT NULL
+);
+"""
+
+
+def task_from_row(row):
+    return Task(row[1], row[2], TaskStatus(row[3]), row[4], row[5], row[6], task_id=row[0])
+
+
+def is_due_date(due_date):
+    return due_ordinal(due_date) != NO_DUE_DATE
+
+
+def task_to_row(task):
+    return (task.id, task.title, task.description, task.status.value, task.due_date, task.assignee, task.progress)
+
+
+# Хранилище задач с тем же интерфейсом, что и TaskStore, но поверх таблицы tasks.
+class SqliteTaskStore:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def _select(self, where="", params=(), order="id"):
+        cursor = self.connection.execute(f"SELECT {TASK_COLUMNS} FROM tasks {where} ORDER BY {order}", params)
+        for row in cursor:
+            yield task_from_row(row)
+
+    def __iter__(self):
+        return self._select()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def __contains__(self, task_id):
+        return self.connection.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone() is not None
+
+    def get(self, task_id):
+        row = self.connection.execute(f"SELECT {TASK_COLUMNS} FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return task_from_row(row) if row is not None else None
+
+    def add(self, task):
+        self.connection.execute(f"INSERT OR REPLACE INTO tasks ({TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                task_to_row(task))
+
+    def remove(self, task_id):
+        task = self.get(task_id)
+        if task is not None:
+            self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        return task
+
+    def set_status(self, task, status):
+        task.status = status
+        self.connection.execute("UPDATE tasks SET status = ? WHERE id = ?", (status.value, task.id))
+
+    def set_progress(self, task, progress):
+        task.progress = progress
+        self.connection.execute("UPDATE tasks SET progress = ? WHERE id = ?", (progress, task.id))
+
+    def set_text(self, task, title, description):
+        task.title = title
+        task.description = description
+        self.connection.execute("UPDATE tasks SET title = ?, description = ? WHERE id = ?",
+                                (title, description, task.id))
+
+    def by_status(self, status):
+        return list(self._select("WHERE status = ?", (status.value,)))
+
+    def by_assignee(self, assignee):
+        return list(self._select("WHERE assignee = ?", (assignee,)))
+
+    def find(self, assignee=None, statuses=None):
+        conditions = []
+        params = []
+        if assignee is not None:
+            conditions.append("assignee = ?")
+            params.append(assignee)
+        if statuses is not None:
+            conditions.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(status.value for status in statuses)
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return self._select(where, params)
+
+
+    # Сроки в формате YYYY-MM-DD сортируются как строки, поэтому порядок и диапазон
+    # start..end (даты, включительно) берутся из индекса. Как и в TaskStore, задачи без
+    # срока (или с неверным сроком) идут последними в порядке ID.
+    def by_deadline(self, assignee=None, start=None, end=None):
+        conditions = []
+        params = []
+        if assignee is not None:
+            conditions.append("assignee = ?")
+            params.append(assignee)
+        if start is not None or end is not None:
+            conditions.append(HAS_DUE_DATE)
+        if start is not None:
+            conditions.append("due_date >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            conditions.append("due_date <= ?")
+            params.append(end.isoformat())
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return self._select(where, params, order=f"{HAS_DUE_DATE} DESC, CASE WHEN {HAS_DUE_DATE} THEN due_date END, id")
+
+    def inbox(self, assignee=None):
+        return list(self.find(assignee=assignee, statuses=[TaskStatus.OPEN, TaskStatus.OVERDUE]))
+
+    # Сводка считается запросом к базе: статус и исполнитель проиндексированы.
+    def summary(self, assignee=None):
+        where, params = ("WHERE assignee = ?", (assignee,)) if assignee is not None else ("", ())
+        statuses = {status: 0 for status in TaskStatus}
+        total = progress_sum = 0
+        for status, count, status_progress in self.connection.execute(
+                f"SELECT status, COUNT(*), SUM(progress) FROM tasks {where} GROUP BY status", params):
+            statuses[TaskStatus(status)] = count
+            total += count
+            progress_sum += status_progress or 0
+        return {'total': total, 'statuses': statuses, 'average_progress': progress_sum / total if total else 0}
+
+    def assignee_counts(self):
+        counts = {}
+        for assignee, status, count in self.connection.execute(
+                "SELECT assignee, status, COUNT(*) FROM tasks GROUP BY assignee, status"):
+            counts.setdefault(assignee, {status: 0 for status in TaskStatus})[TaskStatus(status)] = count
+        return counts
+
+    def promote_overdue(self, today):
+        where = f"WHERE status IN (?, ?) AND due_date < ? AND {HAS_DUE_DATE}"
+        params = (TaskStatus.OPEN.value, TaskStatus.IN_PROGRESS.value, today.isoformat())
+        promoted = list(self._select(where, params))
+        self.connection.executemany("UPDATE tasks SET status = ? WHERE id = ?",
+                                    ((TaskStatus.OVERDUE.value, task.id) for task in promoted))
+        for task in promoted:
+            task.status = TaskStatus.OVERDUE
+        return promoted
+
+
+class SqliteStorage:
+    def __init__(self, config):
+        self.database_file = config.get('database_file', 'tasks.db')
+        self.connection = sqlite3.connect(self.database_file)
+        self.connection.create_function('is_due_date', 1, is_due_date, deterministic=True)
+        self.connection.executescript(SCHEMA)
+
+    def open_store(self):
+        max_id = self.connection.execute("SELECT MAX(id) FROM tasks").fetchone()[0]
+        if max_id is not None:
+            Task._id_counter = max(Task._id_counter, max_id + 1)
+        return SqliteTaskStore(self.connection)
+
+    # Изменения уже выполнены в таблице хранилищем задач, здесь они только фиксируются.
+    def append(self, records):
+        self.connection.commit()
+
+    def save_tasks(self, tasks):
+        self.connection.commit()
+
+    def load_users(self):
+        cursor = self.connection.execute("SELECT username, password, role FROM users")
+        return [{'username': row[0], 'password': row[1], 'role': row[2]} for row in cursor]
+
+    def save_users(self, users):
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO users (username, password, role) VALUES (?, ?, ?)",
+                                        ((user.username, user.password, user.role) for user in users))
+
+    def add_user(self, user, users):
+        self.save_users([user])
+
+    # Перенос задач и пользователей из JSON-файлов одной транзакцией:
+    # при ошибке база остается в прежнем состоянии.
+    def import_json(self, tasks_file, users_file):
+        with open(users_file, 'r', encoding='utf-8') as file:
+            users_data = json.load(file)
+        tasks_count = 0
+        with open(tasks_file, 'r', encoding='utf-8') as file, self.connection:
+            for data in iter_json_array(file):
+                self.connection.execute(f"INSERT OR REPLACE INTO tasks ({TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                        task_to_row(Task.from_dict(data)))
+                tasks_count += 1
+            self.connection.executemany("INSERT OR REPLACE INTO users (username, password, role) VALUES (?, ?, ?)",
+                                        ((data['username'], data['password'], data['role']) for data in users_data))
+        return tasks_count, len(users_data)
@@ -0,0 +1,330 @@
+#Хранение задач и пользователей на диске.
+# JsonStorage - весь список задач в одном файле tasks.json (перезаписывается целиком).
+# JournalStorage - снимок tasks.json плюс журнал изменений, в который каждое изменение
+# дописывается одной строкой; журнал сворачивается в снимок, когда превышает
+# journal_compact_size байт из config.json.
+# SqliteStorage (модуль sqlite_storage) - задачи и пользователи в базе SQLite.
+# ShardedStorage (модуль sharded_storage) - задачи в нескольких файлах с блокировками.
+import json
+import os
+import pickle
+import re
+import tempfile
+
+from instrumentation import add_bytes
+from Task import Task, TaskStatus
+from task_store import TaskStore
+
+
+# Запись файла через временный файл: при сбое посреди записи старый файл остается целым.
+# Имя временного файла уникально (mkstemp), поэтому процессы, одновременно сохраняющие
+# один файл, не пишут в общий временный файл. Возвращает размер записанного файла в байтах.
+def write_atomic(path, write, binary=False):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.',
+                                    suffix='.tmp')
+    try:
+        with open(fd, 'wb') if binary else open(fd, 'w', encoding='utf-8') as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+            size = os.fstat(file.fileno()).st_size
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return size
+
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+# Потоковое чтение JSON-массива верхнего уровня: файл читается кусками по chunk_size
+# символов, элементы разбираются и отдаются по одному, так что в памяти одновременно
+# находятся только текущий кусок файла и один элемент.
+def iter_json_array(file, chunk_size=64 * 1024):
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    state = 'start'
+
+    def read_more():
+        nonlocal buffer, pos, eof
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    while True:
+        pos = WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                raise json.JSONDecodeError("Unexpected end of data", buffer, pos)
+            read_more()
+            continue
+        char = buffer[pos]
+        if state == 'start':
+            if char != '[':
+                raise json.JSONDecodeError("Expecting '['", buffer, pos)
+            pos += 1
+            state = 'first'
+        elif state == 'separator':
+            if char == ']':
+                return
+            if char != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            state = 'value'
+        else:
+            if state == 'first' and char == ']':
+                return
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                read_more()
+                continue
+            # Число у конца куска может быть обрезано ("12" от "123", "1.5" от "1.5e3"),
+            # поэтому за значением должно быть прочитано еще несколько символов.
+            if not eof and len(buffer) - end < 3:
+                read_more()
+                continue
+            yield value
+            pos = end
+            state = 'separator'
+
+
+# Двоичный снимок загруженных данных (pickle) рядом с исходными файлами. Снимок годен,
+# пока у исходных файлов не изменились inode, время изменения и размер; иначе данные
+# читаются из JSON заново и снимок перезаписывается. После сохранения файла трекером
+# снимок обновляется сразу, поэтому следующий запуск тоже читает снимок.
+class SnapshotCache:
+    def __init__(self, path, sources):
+        self.path = path
+        self.sources = sources
+
+    def key(self):
+        key = []
+        for source in self.sources:
+            try:
+                stat = os.stat(source)
+            except FileNotFoundError:
+                key.append((source, None))
+            else:
+                key.append((source, stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        return tuple(key)
+
+    def load(self, key):
+        try:
+            with open(self.path, 'rb') as file:
+                if pickle.load(file) != key:
+                    return None
+                data = pickle.load(file)
+                add_bytes('load_snapshot', read=file.tell())
+                return data
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def save(self, key, data):
+        def write(file):
+            pickle.dump(key, file, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, file, pickle.HIGHEST_PROTOCOL)
+        try:
+            add_bytes('save_snapshot', written=write_atomic(self.path, write, binary=True))
+        except OSError:
+            pass
+
+
+def task_to_tuple(task):
+    return (task.id, task.title, task.description, task.status.name, task.due_date, task.assignee, task.progress)
+
+
+def task_from_tuple(row):
+    return Task(row[1], row[2], TaskStatus[row[3]], row[4], row[5], row[6], task_id=row[0])
+
+
+class JsonStorage:
+    def __init__(self, config):
+        self.tasks_file = config['tasks_file']
+        self.users_file = config.get('users_file', 'users.json')
+        self.progress_every = config.get('load_progress_every', 100000)
+        self.snapshot_cache = config.get('snapshot_cache', True)
+
+    def _cache(self, path):
+        return SnapshotCache(path + '.cache', [path]) if self.snapshot_cache else None
+
+    # Снимок обновляется сразу после записи файла, чтобы следующий запуск не разбирал JSON.
+    # Если файл уже перезаписал другой процесс (размер не тот, что записан), снимок не пишется.
+    def _refresh_snapshot(self, cache, size, data):
+        if cache is None:
+            return
+        key = cache.key()
+        if key[0][-1] == size:
+            cache.save(key, data)
+
+    def open_store(self):
+        cache = self._cache(self.tasks_file)
+        if cache is not None:
+            # Ключ берется до чтения файлов: если они изменятся во время загрузки, снимок не совпадет.
+            key = cache.key()
+            rows = cache.load(key)
+            if rows is not None:
+                return TaskStore(task_from_tuple(row) for row in rows)
+        store = self._load_store()
+        if cache is not None:
+            cache.save(key, [task_to_tuple(task) for task in store])
+        return store
+
+    def _load_store(self):
+        with open(self.tasks_file, 'r', encoding='utf-8') as file:
+            add_bytes('load_tasks', read=os.fstat(file.fileno()).st_size)
+            return TaskStore(self._iter_tasks(file))
+
+    # Задачи создаются по мере разбора файла, промежуточный список словарей не строится.
+    def _iter_tasks(self, file):
+        count = 0
+        for data in iter_json_array(file):
+            yield Task.from_dict(data)
+            count += 1
+            if self.progress_every and count % self.progress_every == 0:
+                print(f"Загружено задач: {count}")
+
+    # Изменения сохраняются только полной перезаписью в save_tasks.
+    def append(self, records):
+        pass
+
+    def save_tasks(self, tasks):
+        size = write_atomic(self.tasks_file, lambda file: json.dump([task.to_dict() for task in tasks], file, indent=4))
+        add_bytes('save_tasks', written=size)
+        self._refresh_snapshot(self._cache(self.tasks_file), size, [task_to_tuple(task) for task in tasks])
+
+    def load_users(self):
+        cache = self._cache(self.users_file)
+        if cache is not None:
+            key = cache.key()
+            users = cache.load(key)
+            if users is not None:
+                return users
+        with open(self.users_file, 'r', encoding='utf-8') as file:
+            add_bytes('load_users', read=os.fstat(file.fileno()).st_size)
+            users = json.load(file)
+        if cache is not None:
+            cache.save(key, users)
+        return users
+
+    def save_users(self, users):
+        users = [user.to_dict() for user in users]
+        size = write_atomic(self.users_file, lambda file: json.dump(users, file, indent=4))
+        add_bytes('save_users', written=size)
+        self._refresh_snapshot(self._cache(self.users_file), size, users)
+
+    # users.json - один JSON-массив, поэтому новый пользователь сохраняется перезаписью файла.
+    def add_user(self, user, users):
+        self.save_users(users)
+
+
+class JournalStorage(JsonStorage):
+    def __init__(self, config):
+        super().__init__(config)
+        self.journal_file = config.get('journal_file', self.tasks_file + '.log')
+        self.compact_size = config.get('journal_compact_size', 1024 * 1024)
+
+    # Снимок *.cache соответствует только tasks.json, журнал применяется к нему при каждой загрузке.
+    def open_store(self):
+        try:
+            store = super().open_store()
+        except FileNotFoundError:
+            if not os.path.exists(self.journal_file):
+                raise
+            store = TaskStore()
+        self._replay(store)
+        return store
+
+    def _replay(self, store):
+        try:
+            file = open(self.journal_file, 'rb')
+        except FileNotFoundError:
+            return
+        valid_size = 0
+        with file:
+            for line in file:
+                # Недописанная последняя строка (сбой во время записи) отбрасывается.
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                apply_record(store, record)
+                valid_size += len(line)
+        add_bytes('load_tasks', read=valid_size)
+        if valid_size < os.path.getsize(self.journal_file):
+            with open(self.journal_file, 'r+b') as file:
+                file.truncate(valid_size)
+
+    def append(self, records):
+        if not records:
+            return
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        add_bytes('save_tasks', written=len(data.encode('utf-8')))
+        with open(self.journal_file, 'a', encoding='utf-8') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def save_tasks(self, tasks):
+        try:
+            journal_size = os.path.getsize(self.journal_file)
+        except FileNotFoundError:
+            journal_size = 0
+        if journal_size > self.compact_size or not os.path.exists(self.tasks_file):
+            self.compact(tasks)
+
+    # Сворачивание журнала: сначала атомарно пишется новый снимок, затем журнал очищается.
+    # Если сбой случится между этими шагами, повторное применение журнала к новому
+    # снимку даст тот же результат, так как все записи идемпотентны.
+    def compact(self, tasks):
+        super().save_tasks(tasks)
+        with open(self.journal_file, 'w', encoding='utf-8') as file:
+            file.flush()
+            os.fsync(file.fileno())
+
+
+def apply_record(store, record):
+    op = record['op']
+    if op == 'add':
+        store.add(Task.from_dict(record['task']))
+        return
+    if op == 'remove':
+        store.remove(record['id'])
+        return
+    task = store.get(record['id'])
+    if task is None:
+        return
+    if op == 'status':
+        store.set_status(task, TaskStatus[record['status'].replace(" ", "_").upper()])
+    elif op == 'progress':
+        store.set_progress(task, record['progress'])
+    elif op == 'edit':
+        store.set_text(task, record['title'], record['description'])
+
+
+def open_storage(config):
+    backend = config.get('storage_backend', 'json')
+    if backend == 'journal':
+        return JournalStorage(config)
+    if backend == 'sqlite':
+        from sqlite_storage import SqliteStorage
+        return SqliteStorage(config)
+    if backend == 'sharded':
+        from sharded_storage import ShardedStorage
+        return ShardedStorage(config)
+    return JsonStorage(config)
@@ -0,0 +1,248 @@
+#Хранилище задач в памяти с индексами.
+# Основной индекс id -> Task и вторичные индексы по исполнителю и по статусу,
+# чтобы поиск по id, статусу и исполнителю не требовал просмотра всех задач.
+# Сроки выполнения разбираются в даты один раз для каждой строки срока; по ним ведутся
+# упорядоченный по сроку список задач и куча незавершенных задач для пометки просроченных.
+# Счетчики задач по исполнителю и статусу и суммы прогресса обновляются при каждом
+# изменении, поэтому сводка (summary) не требует просмотра задач; так же ведется ящик
+# уведомлений исполнителя - его задачи в статусах OPEN и OVERDUE.
+import datetime
+import heapq
+from bisect import bisect_left
+from operator import attrgetter
+
+from Task import TaskStatus
+
+# Статусы задач, о которых уведомляется исполнитель при входе.
+NOTIFY_STATUSES = (TaskStatus.OPEN, TaskStatus.OVERDUE)
+# Статусы, из которых задача с истекшим сроком переводится в OVERDUE.
+ACTIVE_STATUSES = (TaskStatus.OPEN, TaskStatus.IN_PROGRESS)
+# Задачи без срока или с нераспознанным сроком идут в конце списка сроков.
+NO_DUE_DATE = datetime.date.max.toordinal() + 1
+
+_due_ordinals = {}
+
+
+# Срок выполнения (YYYY-MM-DD) как номер дня; результат кэшируется для каждой строки.
+def due_ordinal(due_date):
+    ordinal = _due_ordinals.get(due_date)
+    if ordinal is None:
+        try:
+            ordinal = datetime.date.fromisoformat(due_date).toordinal()
+        except (TypeError, ValueError):
+            ordinal = NO_DUE_DATE
+        if len(_due_ordinals) < 100000:
+            _due_ordinals[due_date] = ordinal
+    return ordinal
+
+
+# Номер дня срока в диапазоне low..high (границы включительно, None - без границы);
+# задачи без срока в диапазон не попадают.
+def in_range(ordinal, low, high):
+    return ordinal != NO_DUE_DATE and (low is None or ordinal >= low) and (high is None or ordinal <= high)
+
+
+class TaskStore:
+    def __init__(self, tasks=()):
+        self._by_id = {}
+        self._by_assignee = {}
+        self._by_status = {status: {} for status in TaskStatus}
+        # Пары (срок, id); удаленные и измененные записи отбрасываются при чтении.
+        self._deadlines = []
+        self._deadlines_sorted = True
+        self._overdue_heap = []
+        self._counts = {}
+        self._progress_sum = 0
+        self._assignee_progress = {}
+        self._inbox = {}
+        for task in tasks:
+            self.add(task)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, task_id):
+        return task_id in self._by_id
+
+    def get(self, task_id):
+        return self._by_id.get(task_id)
+
+    def add(self, task):
+        old = self._by_id.get(task.id)
+        if old is not None:
+            self._unindex(old)
+        self._by_id[task.id] = task
+        self._by_assignee.setdefault(task.assignee, {})[task.id] = task
+        self._by_status[task.status][task.id] = task
+        self._count(task.assignee, task.status, 1)
+        self._add_progress(task.assignee, task.progress)
+        if task.status in NOTIFY_STATUSES:
+            self._inbox.setdefault(task.assignee, {})[task.id] = task
+        entry = (due_ordinal(task.due_date), task.id)
+        self._deadlines.append(entry)
+        self._deadlines_sorted = False
+        if len(self._deadlines) > 2 * len(self._by_id):
+            self._compact_deadlines()
+        if task.status in ACTIVE_STATUSES:
+            self._push_overdue(entry)
+
+    def remove(self, task_id):
+        task = self._by_id.pop(task_id, None)
+        if task is not None:
+            self._unindex(task)
+        return task
+
+    def set_status(self, task, status):
+        del self._by_status[task.status][task.id]
+        self._count(task.assignee, task.status, -1)
+        self._count(task.assignee, status, 1)
+        if task.status in NOTIFY_STATUSES:
+            self._leave_inbox(task)
+        if status in NOTIFY_STATUSES:
+            self._inbox.setdefault(task.assignee, {})[task.id] = task
+        was_active = task.status in ACTIVE_STATUSES
+        task.status = status
+        self._by_status[status][task.id] = task
+        # Между OPEN и IN_PROGRESS запись в куче у задачи уже есть.
+        if status in ACTIVE_STATUSES and not was_active:
+            self._push_overdue((due_ordinal(task.due_date), task.id))
+
+    def set_progress(self, task, progress):
+        self._add_progress(task.assignee, progress - task.progress)
+        task.progress = progress
+
+    def set_text(self, task, title, description):
+        task.title = title
+        task.description = description
+
+    def _count(self, assignee, status, delta):
+        key = (assignee, status)
+        count = self._counts.get(key, 0) + delta
+        if count:
+            self._counts[key] = count
+        else:
+            del self._counts[key]
+
+    def _add_progress(self, assignee, delta):
+        self._progress_sum += delta
+        self._assignee_progress[assignee] = self._assignee_progress.get(assignee, 0) + delta
+
+    def _leave_inbox(self, task):
+        inbox = self._inbox.get(task.assignee)
+        if inbox is not None:
+            inbox.pop(task.id, None)
+            if not inbox:
+                del self._inbox[task.assignee]
+
+    # Задачи для уведомлений (OPEN и OVERDUE), упорядоченные по id: из ящика исполнителя
+    # или, без исполнителя, из индекса по статусу.
+    def inbox(self, assignee=None):
+        if assignee is None:
+            return self.find(statuses=NOTIFY_STATUSES)
+        return sorted(self._inbox.get(assignee, {}).values(), key=attrgetter('id'))
+
+    # Количество задач по статусам и средний прогресс (всех задач или задач исполнителя).
+    def summary(self, assignee=None):
+        if assignee is None:
+            statuses = {status: len(self._by_status[status]) for status in TaskStatus}
+            total, progress_sum = len(self._by_id), self._progress_sum
+        else:
+            statuses = {status: self._counts.get((assignee, status), 0) for status in TaskStatus}
+            total = len(self._by_assignee.get(assignee, ()))
+            progress_sum = self._assignee_progress.get(assignee, 0)
+        return {'total': total, 'statuses': statuses, 'average_progress': progress_sum / total if total else 0}
+
+    # Количество задач каждого исполнителя по статусам.
+    def assignee_counts(self):
+        counts = {}
+        for (assignee, status), count in self._counts.items():
+            counts.setdefault(assignee, {status: 0 for status in TaskStatus})[status] = count
+        return counts
+
+    def by_status(self, status):
+        return list(self._by_status[status].values())
+
+    def by_assignee(self, assignee):
+        return list(self._by_assignee.get(assignee, {}).values())
+
+    # Задачи исполнителя и/или с одним из статусов, упорядоченные по id.
+    # Берется меньший из подходящих индексов, остальные условия проверяются по нему.
+    def find(self, assignee=None, statuses=None):
+        if assignee is not None:
+            tasks = self._by_assignee.get(assignee, {}).values()
+            if statuses is not None:
+                tasks = [task for task in tasks if task.status in statuses]
+        elif statuses is not None:
+            tasks = [task for status in statuses for task in self._by_status[status].values()]
+        else:
+            tasks = self._by_id.values()
+        return sorted(tasks, key=attrgetter('id'))
+
+    def _is_current(self, entry):
+        task = self._by_id.get(entry[1])
+        return task is not None and due_ordinal(task.due_date) == entry[0]
+
+    # Устаревшие записи (удаленные задачи, смена статуса) отбрасываются, когда их становится
+    # больше, чем задач, поэтому список сроков и куча не растут без предела.
+    def _compact_deadlines(self):
+        self._deadlines = sorted({entry for entry in self._deadlines if self._is_current(entry)})
+        self._deadlines_sorted = True
+
+    def _push_overdue(self, entry):
+        if entry[0] == NO_DUE_DATE:
+            return
+        heapq.heappush(self._overdue_heap, entry)
+        if len(self._overdue_heap) > 2 * len(self._by_id):
+            self._overdue_heap = [entry for entry in set(self._overdue_heap) if self._is_current(entry)
+                                  and self._by_id[entry[1]].status in ACTIVE_STATUSES]
+            heapq.heapify(self._overdue_heap)
+
+    # Задачи в порядке сроков выполнения, при указании start/end (даты, включительно) -
+    # только со сроком в этом диапазоне. Список пересортировывается только после добавления
+    # задач, а не при каждом вызове, и диапазон находится в нем двоичным поиском;
+    # для исполнителя сортируются только его задачи.
+    def by_deadline(self, assignee=None, start=None, end=None):
+        low = start.toordinal() if start is not None else None
+        high = end.toordinal() if end is not None else None
+        if assignee is not None:
+            tasks = self._by_assignee.get(assignee, {}).values()
+            if low is not None or high is not None:
+                tasks = [task for task in tasks if in_range(due_ordinal(task.due_date), low, high)]
+            return sorted(tasks, key=lambda task: (due_ordinal(task.due_date), task.id))
+        if not self._deadlines_sorted:
+            self._compact_deadlines()
+        first = 0 if low is None else bisect_left(self._deadlines, (low,))
+        last = len(self._deadlines) if high is None else bisect_left(self._deadlines, (high + 1,))
+        if high is None and low is not None:
+            last = bisect_left(self._deadlines, (NO_DUE_DATE,))
+        return [self._by_id[entry[1]] for entry in self._deadlines[first:last] if self._is_current(entry)]
+
+    # Перевод в OVERDUE незавершенных задач со сроком раньше today. Из кучи извлекаются
+    # только истекшие записи, остальные задачи не просматриваются.
+    def promote_overdue(self, today):
+        today = today.toordinal()
+        promoted = []
+        heap = self._overdue_heap
+        while heap and heap[0][0] < today:
+            entry = heapq.heappop(heap)
+            task = self._by_id.get(entry[1])
+            if task is not None and task.status in ACTIVE_STATUSES and self._is_current(entry):
+                self.set_status(task, TaskStatus.OVERDUE)
+                promoted.append(task)
+        return promoted
+
+    def _unindex(self, task):
+        if self._by_status[task.status].pop(task.id, None) is not None:
+            self._count(task.assignee, task.status, -1)
+            if task.status in NOTIFY_STATUSES:
+                self._leave_inbox(task)
+            self._add_progress(task.assignee, -task.progress)
+        bucket = self._by_assignee.get(task.assignee)
+        if bucket is not None:
+            bucket.pop(task.id, None)
+            if not bucket:
+                del self._by_assignee[task.assignee]
+                self._assignee_progress.pop(task.assignee, None)
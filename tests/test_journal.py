@@ -0,0 +1,53 @@
+#Проверка восстановления журнала изменений (JournalStorage) после сбоя во время записи.
+# Запуск из корня проекта: python -m pytest tests
+import json
+import os
+import tempfile
+import unittest
+
+from Task import Task, TaskStatus
+from storage import JournalStorage
+
+
+class JournalReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.tasks_file = os.path.join(self.workdir.name, 'tasks.json')
+        self.storage = JournalStorage({'tasks_file': self.tasks_file, 'snapshot_cache': False})
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def write_journal(self, records, tail=''):
+        with open(self.storage.journal_file, 'w', encoding='utf-8') as file:
+            for record in records:
+                file.write(json.dumps(record) + '\n')
+            file.write(tail)
+
+    def test_torn_last_line_is_dropped(self):
+        task = Task('Отчет', 'квартал', TaskStatus.OPEN, '2025-01-01', 'Olga', 0, task_id=1)
+        self.write_journal([{'op': 'add', 'task': task.to_dict()},
+                            {'op': 'progress', 'id': 1, 'progress': 40}],
+                           tail='{"op": "status", "id": 1, "sta')
+        valid_size = os.path.getsize(self.storage.journal_file) - len('{"op": "status", "id": 1, "sta')
+
+        store = self.storage.open_store()
+
+        self.assertEqual([task.id for task in store], [1])
+        self.assertEqual(store.get(1).progress, 40)
+        self.assertEqual(store.get(1).status, TaskStatus.OPEN)
+        self.assertEqual(os.path.getsize(self.storage.journal_file), valid_size)
+
+    def test_append_after_torn_line_is_replayed(self):
+        task = Task('Отчет', '', TaskStatus.OPEN, None, 'Olga', 0, task_id=1)
+        self.write_journal([{'op': 'add', 'task': task.to_dict()}], tail='{"op": "remo')
+        self.storage.open_store()
+        self.storage.append([{'op': 'status', 'id': 1, 'status': 'COMPLETED'}])
+
+        store = self.storage.open_store()
+
+        self.assertEqual(store.get(1).status, TaskStatus.COMPLETED)
+
+
+if __name__ == '__main__':
+    unittest.main()
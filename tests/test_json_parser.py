@@ -0,0 +1,52 @@
+#Проверка потокового разбора JSON-массива (iter_json_array) на границах кусков чтения.
+# Запуск из корня проекта: python -m pytest tests
+import io
+import json
+import unittest
+
+from storage import iter_json_array
+
+SAMPLE = json.dumps([
+    {'id': 1, 'title': 'Отчет "квартал" \\ итог', 'progress': 123, 'due_date': None},
+    12345,
+    1.5e3,
+    -0.25,
+    'строка с , и ] внутри',
+    [],
+    {},
+    [1, [2, [3]]],
+    True,
+    None,
+    {'id': 2, 'title': 'x' * 100, 'description': 'журнал'},
+], ensure_ascii=False, indent=4)
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    def parse(self, text, chunk_size):
+        return list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+
+    def test_every_chunk_size_matches_json_loads(self):
+        expected = json.loads(SAMPLE)
+        for chunk_size in range(1, 40):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.parse(SAMPLE, chunk_size), expected)
+
+    def test_number_at_end_of_chunk_is_not_truncated(self):
+        for text in ('[123456]', '[1, 2.5e10, 300]', '[  -77  ,8]'):
+            for chunk_size in range(1, len(text) + 1):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    self.assertEqual(self.parse(text, chunk_size), json.loads(text))
+
+    def test_empty_array(self):
+        for chunk_size in (1, 2, 64):
+            self.assertEqual(self.parse(' [ \n ] ', chunk_size), [])
+
+    def test_truncated_array_raises(self):
+        for chunk_size in (1, 3, 64):
+            with self.subTest(chunk_size=chunk_size):
+                with self.assertRaises(json.JSONDecodeError):
+                    self.parse('[{"id": 1}, {"id": 2', chunk_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#Проверка составных запросов query.Query: результат при любом выборе источника задач
+# (индекс исполнителя, статусов, сроков или все задачи) совпадает с перебором всех задач,
+# включая сортировку по убыванию, offset/limit и ограничение видимости для пользователя.
+# Запуск из корня проекта: python -m pytest tests
+import datetime
+import itertools
+import random
+import unittest
+
+from Task import Task, TaskStatus
+from query import SORT_KEYS, Query
+from task_store import TaskStore, due_ordinal, in_range
+from users import User
+
+ASSIGNEES = ['Olga', 'Ivan', 'Petr']
+DUE_DATES = [None, 'не дата', '2024-01-01', '2024-01-10', '2024-02-01', '2024-03-15']
+
+
+def make_store(count=120, seed=3):
+    rng = random.Random(seed)
+    return TaskStore(Task(rng.choice(['Отчет', 'план', 'Бюджет']), '', rng.choice(list(TaskStatus)),
+                          rng.choice(DUE_DATES), rng.choice(ASSIGNEES), rng.randrange(101), task_id=task_id)
+                     for task_id in range(1, count + 1))
+
+
+def expected(store, statuses=None, assignee=None, visible=None, due=(None, None), progress=(None, None),
+             order='id', reverse=False, offset=0, limit=None):
+    low_due = due[0].toordinal() if due[0] else None
+    high_due = due[1].toordinal() if due[1] else None
+    tasks = [task for task in store
+             if (statuses is None or task.status in statuses)
+             and (assignee is None or task.assignee == assignee)
+             and (visible is None or task.assignee == visible)
+             and (due == (None, None) or in_range(due_ordinal(task.due_date), low_due, high_due))
+             and (progress[0] is None or task.progress >= progress[0])
+             and (progress[1] is None or task.progress <= progress[1])]
+    tasks.sort(key=SORT_KEYS[order], reverse=reverse)
+    return tasks[offset:None if limit is None else offset + limit]
+
+
+class QueryTest(unittest.TestCase):
+    def setUp(self):
+        self.store = make_store()
+
+    def test_combinations_match_brute_force(self):
+        statuses_options = [None, (TaskStatus.OPEN,), (TaskStatus.OPEN, TaskStatus.OVERDUE)]
+        assignee_options = [None, 'Olga']
+        due_options = [(None, None), (datetime.date(2024, 1, 5), None), (None, datetime.date(2024, 2, 1))]
+        progress_options = [(None, None), (20, 80)]
+        page_options = [(0, None), (3, 5), (0, 1)]
+        for statuses, assignee, due, progress, order, reverse, (offset, limit) in itertools.product(
+                statuses_options, assignee_options, due_options, progress_options, ['id', 'due_date', 'progress'],
+                [False, True], page_options):
+            query = Query(self.store)
+            if statuses is not None:
+                query = query.status(*statuses)
+            if assignee is not None:
+                query = query.assignee(assignee)
+            if due != (None, None):
+                query = query.due_between(*due)
+            if progress != (None, None):
+                query = query.progress_between(*progress)
+            query = query.order_by(order, reverse=reverse).offset(offset).limit(limit)
+            with self.subTest(statuses=statuses, assignee=assignee, due=due, progress=progress, order=order,
+                              reverse=reverse, offset=offset, limit=limit):
+                self.assertEqual(list(query), expected(self.store, statuses, assignee, None, due, progress,
+                                                       order, reverse, offset, limit))
+
+    def test_visibility(self):
+        user = User('Ivan', 'x', 'user')
+        admin = User('Olga', 'x', 'admin')
+        self.assertEqual(list(Query(self.store).visible_to(user)), expected(self.store, visible='Ivan'))
+        self.assertEqual(list(Query(self.store).visible_to(admin)), expected(self.store))
+        self.assertEqual(list(Query(self.store).visible_to(user).assignee('Olga')), [])
+        self.assertEqual(Query(self.store).visible_to(user).assignee('Ivan').count(),
+                         len(expected(self.store, assignee='Ivan')))
+
+    def test_ordered_sources_are_not_sorted_again(self):
+        query = Query(self.store)
+        self.assertTrue(query._source(None)[1])
+        self.assertTrue(query.order_by('due_date')._source(None)[1])
+        self.assertTrue(query.order_by('due_date')._source('Olga')[1])
+        self.assertTrue(query.status(TaskStatus.OPEN)._source(None)[1])
+        self.assertFalse(query.order_by('progress')._source(None)[1])
+        self.assertFalse(query.status(TaskStatus.OPEN).order_by('due_date')._source(None)[1])
+
+    def test_first_and_invalid_order(self):
+        self.assertIs(Query(self.store).order_by('progress', reverse=True).first(),
+                      expected(self.store, order='progress', reverse=True)[0])
+        self.assertIsNone(Query(TaskStore()).first())
+        with self.assertRaises(ValueError):
+            Query(self.store).order_by('nope')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#Проверка кэша запросов: вытеснение LRU, сброс при смене data_version и то, что кэшированные
+# запросы TaskTracker видят изменения задач сразу после них.
+# Запуск из корня проекта: python -m pytest tests
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import TaskTracker
+from Task import Task, TaskStatus
+from decorators import QueryCache
+
+
+class QueryCacheTest(unittest.TestCase):
+    def test_lru_eviction_and_stats(self):
+        cache = QueryCache(maxsize=2)
+        with self.assertRaises(KeyError):
+            cache.get('a', 1)
+        cache.put('a', 'A')
+        cache.put('b', 'B')
+        self.assertEqual(cache.get('a', 1), 'A')
+        cache.put('c', 'C')
+        with self.assertRaises(KeyError):
+            cache.get('b', 1)
+        self.assertEqual(cache.get('c', 1), 'C')
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (2, 2, 1))
+
+    def test_new_version_clears_entries(self):
+        cache = QueryCache()
+        with self.assertRaises(KeyError):
+            cache.get('a', 1)
+        cache.put('a', 'A')
+        self.assertEqual(cache.get('a', 1), 'A')
+        with self.assertRaises(KeyError):
+            cache.get('a', 2)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats()['invalidations'], 1)
+
+
+class CachedQueryTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        users_file = os.path.join(self.workdir.name, 'users.json')
+        with open(users_file, 'w', encoding='utf-8') as file:
+            json.dump([{'username': 'Olga', 'password': '1', 'role': 'admin'},
+                       {'username': 'Ivan', 'password': '1', 'role': 'user'}], file)
+        config = {'tasks_file': os.path.join(self.workdir.name, 'tasks.json'), 'users_file': users_file,
+                  'snapshot_cache': False}
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.tracker = TaskTracker.TaskTracker(config)
+        self.tracker.current_user = self.tracker.users.get('Olga')
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def test_results_follow_changes(self):
+        tracker = self.tracker
+        self.assertEqual(tracker.tasks_by_status(TaskStatus.OPEN), ())
+        task = Task('Отчет', '', TaskStatus.OPEN, '2024-01-01', 'Ivan')
+        tracker.add_task(task)
+        self.assertEqual(tracker.tasks_by_status(TaskStatus.OPEN), (task,))
+        self.assertEqual(tracker.tasks_by_status(TaskStatus.OPEN), (task,))
+        self.assertEqual(tracker.query_cache.hits, 1)
+        tracker.change_task_status(task.id, 'COMPLETED')
+        self.assertEqual(tracker.tasks_by_status(TaskStatus.OPEN), ())
+        tracker.remove_task(task.id)
+        self.assertEqual(tracker.tasks_by_status(TaskStatus.COMPLETED), ())
+
+    def test_results_are_cached_per_user(self):
+        tracker = self.tracker
+        own = Task('Свое', '', TaskStatus.OPEN, None, 'Ivan')
+        tracker.add_task(own)
+        tracker.add_task(Task('Чужое', '', TaskStatus.OPEN, None, 'Olga'))
+        self.assertEqual(len(tracker.visible_tasks()), 2)
+        tracker.current_user = tracker.users.get('Ivan')
+        self.assertEqual(tracker.visible_tasks(), (own,))
+
+
+if __name__ == '__main__':
+    unittest.main()
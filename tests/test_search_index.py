@@ -0,0 +1,75 @@
+#Проверка полнотекстового индекса: поиск по началу слова, ранжирование (название весит
+# больше описания, точное слово больше префикса), изменения текста и журнал индекса.
+# Запуск из корня проекта: python -m pytest tests
+import os
+import tempfile
+import unittest
+
+from Task import Task, TaskStatus
+from search_index import SearchIndex, append_log, text_record, tokenize
+
+
+def task(task_id, title, description=''):
+    return Task(title, description, TaskStatus.OPEN, None, 'Olga', task_id=task_id)
+
+
+class SearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tasks = [task(1, 'Квартальный отчет', 'собрать цифры'),
+                      task(2, 'Отчетность', 'отчет для банка'),
+                      task(3, 'План', 'квартальный план, отчет'),
+                      task(4, 'Ёлка', 'купить ёлку')]
+        self.index = SearchIndex(self.tasks)
+
+    def ids(self, query, **kwargs):
+        return [task_id for _, task_id in self.index.search(query, **kwargs)]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize('Ёлка, ЁЖ-2025!'), ['елка', 'еж', '2025'])
+        self.assertEqual(tokenize(None), [])
+
+    def test_prefix_and_ranking(self):
+        # Точное слово в названии, затем префикс в названии, затем слово в описании.
+        self.assertEqual(self.ids('отчет'), [1, 2, 3])
+        # По префиксу редкое слово ("отчетность") весит больше частого ("отчет").
+        self.assertEqual(self.ids('отч'), [2, 1, 3])
+        self.assertEqual(self.ids('елк'), [4])
+        self.assertEqual(self.ids('ЁЛКА'), [4])
+
+    def test_all_terms_required(self):
+        self.assertEqual(self.ids('квартал отчет'), [1, 3])
+        self.assertEqual(self.ids('квартал банк'), [])
+        self.assertEqual(self.ids(''), [])
+
+    def test_limit_and_allowed(self):
+        self.assertEqual(self.ids('отчет', limit=1), [1])
+        self.assertEqual(self.ids('отчет', allowed=lambda task_id: task_id != 1), [2, 3])
+
+    def test_edit_and_remove(self):
+        self.index.add_text(1, 'Бюджет', 'смета')
+        self.index.remove(3)
+        self.assertEqual(self.ids('отчет'), [2])
+        self.assertEqual(self.ids('бюдж'), [1])
+        self.assertEqual(self.index.expand('кварт'), [])
+        self.assertEqual(len(self.index), 3)
+
+    def test_log_replay_matches_rebuilt_index(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, 'tasks.json.search')
+            self.index.save(path)
+            self.tasks[0].title = 'Годовой отчет'
+            added = task(5, 'Новый отчет')
+            records = [text_record(self.tasks[0]), {'op': 'remove', 'id': 2}, text_record(added)]
+            append_log(path, records)
+            tasks = [self.tasks[0], self.tasks[2], self.tasks[3], added]
+
+            loaded = SearchIndex.load(path, tasks)
+
+            self.assertIsNotNone(loaded)
+            self.assertEqual(loaded.log_records, 3)
+            self.assertEqual(loaded.search('отчет'), SearchIndex(tasks).search('отчет'))
+            self.assertIsNone(SearchIndex.load(path, tasks[:-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
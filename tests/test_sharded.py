@@ -0,0 +1,80 @@
+#Проверка слияния шардов (ShardedStorage), когда другой процесс успел сохранить тот же шард.
+# Два экземпляра хранилища над одним каталогом изображают два процесса.
+# Запуск из корня проекта: python -m pytest tests
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from Task import Task, TaskStatus
+from sharded_storage import ShardedStorage
+
+
+class ShardMergeTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.config = {
+            'tasks_file': os.path.join(self.workdir.name, 'tasks.json'),
+            'shard_dir': os.path.join(self.workdir.name, 'tasks_shards'),
+            'shard_count': 2,
+            'snapshot_cache': False,
+        }
+        first = ShardedStorage(self.config)
+        store = first.open_store()
+        task = Task('Общая', '', TaskStatus.OPEN, None, 'Olga', 0, task_id=2)
+        store.add(task)
+        first.append([{'op': 'add', 'task': task.to_dict()}])
+        first.save_tasks(store)
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def open(self):
+        storage = ShardedStorage(self.config)
+        return storage, storage.open_store()
+
+    def add(self, storage, store, task):
+        store.add(task)
+        storage.append([{'op': 'add', 'task': task.to_dict()}])
+
+    def test_concurrent_changes_to_one_task_are_kept(self):
+        storage_a, store_a = self.open()
+        storage_b, store_b = self.open()
+        store_a.set_progress(store_a.get(2), 50)
+        storage_a.append([{'op': 'progress', 'id': 2, 'progress': 50}])
+        storage_a.save_tasks(store_a)
+        store_b.set_status(store_b.get(2), TaskStatus.COMPLETED)
+        storage_b.append([{'op': 'status', 'id': 2, 'status': 'COMPLETED'}])
+        storage_b.save_tasks(store_b)
+
+        self.assertTrue(storage_b.merged)
+        _, store = self.open()
+        self.assertEqual(store.get(2).progress, 50)
+        self.assertEqual(store.get(2).status, TaskStatus.COMPLETED)
+
+    def test_colliding_new_task_gets_free_id_in_same_shard(self):
+        storage_a, store_a = self.open()
+        storage_b, store_b = self.open()
+        self.add(storage_a, store_a, Task('От A', '', TaskStatus.OPEN, None, 'Olga', 0, task_id=4))
+        storage_a.save_tasks(store_a)
+        self.add(storage_b, store_b, Task('От B', '', TaskStatus.OPEN, None, 'Olga', 0, task_id=4))
+        storage_b.append([{'op': 'progress', 'id': 4, 'progress': 30}])
+        store_b.set_progress(store_b.get(4), 30)
+        with contextlib.redirect_stdout(io.StringIO()):
+            storage_b.save_tasks(store_b)
+
+        self.assertTrue(storage_b.merged)
+        _, store = self.open()
+        titles = {task.title: task for task in store}
+        self.assertEqual(titles['От A'].id, 4)
+        self.assertEqual(titles['От A'].progress, 0)
+        renamed = titles['От B']
+        self.assertNotIn(renamed.id, (2, 4))
+        self.assertEqual(storage_b.shard_of(renamed.id), storage_b.shard_of(4))
+        self.assertEqual(renamed.progress, 30)
+        self.assertEqual(sorted(task.id for task in store_b), sorted(task.id for task in store))
+
+
+if __name__ == '__main__':
+    unittest.main()
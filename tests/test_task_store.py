@@ -0,0 +1,85 @@
+#Проверка согласованности индексов TaskStore (по статусу, исполнителю, срокам), счетчиков
+# сводки и ящика уведомлений после add/remove/set_status/set_progress/promote_overdue.
+# Запуск из корня проекта: python -m pytest tests
+import datetime
+import random
+import unittest
+
+from Task import Task, TaskStatus
+from task_store import NOTIFY_STATUSES, TaskStore, due_ordinal
+
+ASSIGNEES = ['Olga', 'Ivan', None]
+DUE_DATES = [None, 'не дата', '2025-13-45', '2024-01-01', '2024-01-05', '2024-02-01']
+
+
+class TaskStoreTest(unittest.TestCase):
+    def assert_consistent(self, store, model):
+        tasks = sorted(model.values(), key=lambda task: task.id)
+        self.assertEqual(len(store), len(model))
+        self.assertEqual(store.find(), tasks)
+        for status in TaskStatus:
+            self.assertEqual(store.find(statuses=[status]), [task for task in tasks if task.status == status])
+        # assignee=None в find/inbox/summary означает "все задачи", поэтому проверяются только имена.
+        for assignee in ASSIGNEES[:-1]:
+            own = [task for task in tasks if task.assignee == assignee]
+            self.assertEqual(store.find(assignee=assignee), own)
+            self.assertEqual(store.inbox(assignee), [task for task in own if task.status in NOTIFY_STATUSES])
+            summary = store.summary(assignee)
+            self.assertEqual(summary['total'], len(own))
+            self.assertEqual(summary['statuses'], {status: sum(1 for task in own if task.status == status)
+                                                   for status in TaskStatus})
+            average = sum(task.progress for task in own) / len(own) if own else 0
+            self.assertAlmostEqual(summary['average_progress'], average)
+        self.assertEqual(store.summary()['total'], len(tasks))
+        self.assertEqual(store.inbox(), [task for task in tasks if task.status in NOTIFY_STATUSES])
+        self.assertEqual(store.by_deadline(), sorted(tasks, key=lambda task: (due_ordinal(task.due_date), task.id)))
+
+    def test_random_operations_match_model(self):
+        rng = random.Random(7)
+        store = TaskStore()
+        model = {}
+        for step in range(3000):
+            roll = rng.random()
+            task_id = rng.randrange(1, 40)
+            task = model.get(task_id)
+            if roll < 0.3:
+                task = Task('t', '', rng.choice(list(TaskStatus)), rng.choice(DUE_DATES), rng.choice(ASSIGNEES),
+                            rng.randrange(101), task_id=task_id)
+                store.add(task)
+                model[task_id] = task
+            elif roll < 0.45:
+                self.assertIs(store.remove(task_id), model.pop(task_id, None))
+            elif roll < 0.75 and task is not None:
+                store.set_status(task, rng.choice(list(TaskStatus)))
+            elif roll < 0.9 and task is not None:
+                store.set_progress(task, rng.randrange(101))
+            elif roll >= 0.9:
+                today = datetime.date(2024, 1, rng.randrange(1, 31))
+                expected = sorted(task.id for task in model.values()
+                                  if task.status in (TaskStatus.OPEN, TaskStatus.IN_PROGRESS)
+                                  and due_ordinal(task.due_date) < today.toordinal())
+                self.assertEqual(sorted(task.id for task in store.promote_overdue(today)), expected)
+            if step % 50 == 0:
+                self.assert_consistent(store, model)
+        self.assert_consistent(store, model)
+
+    def test_deadline_range_skips_tasks_without_valid_date(self):
+        store = TaskStore(Task('t', '', TaskStatus.OPEN, due, 'Olga', task_id=i + 1) for i, due in enumerate(DUE_DATES))
+        in_january = store.by_deadline(start=datetime.date(2024, 1, 1), end=datetime.date(2024, 1, 31))
+        self.assertEqual([task.due_date for task in in_january], ['2024-01-01', '2024-01-05'])
+        self.assertEqual([task.due_date for task in store.by_deadline(start=datetime.date(2024, 1, 2))],
+                         ['2024-01-05', '2024-02-01'])
+
+    def test_status_toggles_do_not_grow_internal_lists(self):
+        store = TaskStore([Task('t', '', TaskStatus.OPEN, '2030-01-01', 'Olga', task_id=1)])
+        task = store.get(1)
+        for i in range(1000):
+            store.set_status(task, TaskStatus.IN_PROGRESS if i % 2 == 0 else TaskStatus.COMPLETED)
+            store.add(Task('t', '', TaskStatus.OPEN, '2030-01-01', 'Olga', task_id=2))
+            store.remove(2)
+        self.assertLessEqual(len(store._overdue_heap), 4)
+        self.assertLessEqual(len(store._deadlines), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+#Проверка реестра пользователей: хэши PBKDF2, отказ в повторной регистрации и замена
+# паролей открытым текстом из старых файлов хэшем при первом успешном входе.
+# Запуск из корня проекта: python -m pytest tests
+import unittest
+
+from users import User, UserRegistry, hash_password, is_hashed, verify_password
+
+# Малое число итераций, чтобы тесты выполнялись быстро.
+ITERATIONS = 1000
+
+
+class UserRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.users = UserRegistry([User('Olga', '1', 'admin')], iterations=ITERATIONS)
+
+    def test_register_hashes_password_and_rejects_duplicate(self):
+        user = self.users.register('Ivan', 'secret', 'user')
+        self.assertTrue(is_hashed(user.password))
+        self.assertNotIn('secret', user.password)
+        self.assertTrue(verify_password('secret', user.password))
+        self.assertIsNone(self.users.register('Ivan', 'other', 'admin'))
+        self.assertIsNone(self.users.register('Olga', 'other', 'user'))
+        self.assertEqual(self.users.get('Ivan').role, 'user')
+        self.assertEqual(len(self.users), 2)
+
+    def test_legacy_plaintext_password_is_rehashed_on_login(self):
+        self.assertIsNone(self.users.authenticate('Olga', '2'))
+        self.assertFalse(self.users.changed)
+        user = self.users.authenticate('Olga', '1')
+        self.assertIs(user, self.users.get('Olga'))
+        self.assertTrue(is_hashed(user.password))
+        self.assertTrue(self.users.changed)
+        self.users.forget_verified()
+        self.assertIs(self.users.authenticate('Olga', '1'), user)
+        self.assertIsNone(self.users.authenticate('Olga', '2'))
+
+    def test_verify_cache_does_not_accept_other_password(self):
+        self.users.register('Ivan', 'secret', 'user')
+        self.assertIsNotNone(self.users.authenticate('Ivan', 'secret'))
+        self.assertIsNotNone(self.users.authenticate('Ivan', 'secret'))
+        self.assertIsNone(self.users.authenticate('Ivan', 'Secret'))
+        # После смены хэша (например, из другого процесса) запомненная проверка не действует.
+        self.users.get('Ivan').password = hash_password('new', ITERATIONS)
+        self.assertIsNone(self.users.authenticate('Ivan', 'secret'))
+        self.assertIsNotNone(self.users.authenticate('Ivan', 'new'))
+        self.assertIsNone(self.users.authenticate('Ivan', None))
+        self.assertIsNone(self.users.authenticate('Nobody', 'secret'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#Пользователи трекера: реестр с поиском по имени и хранение паролей в виде соленых хэшей.
+# Пароль хранится строкой "pbkdf2_sha256$<итерации>$<соль>$<хэш>". Пароли из старых файлов
+# (открытым текстом) принимаются и при первом успешном входе заменяются хэшем.
+# Проверка PBKDF2 намеренно медленная, поэтому успешная проверка запоминается на время работы
+# процесса (HMAC пароля со случайным ключом процесса): повторные запросы HTTP API с Basic-
+# аутентификацией не пересчитывают хэш.
+import hashlib
+import hmac
+import os
+
+HASH_SCHEME = 'pbkdf2_sha256'
+DEFAULT_ITERATIONS = 200000
+
+
+def hash_password(password, iterations=DEFAULT_ITERATIONS, salt=None):
+    salt = salt or os.urandom(16).hex()
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('ascii'), iterations)
+    return f"{HASH_SCHEME}${iterations}${salt}${digest.hex()}"
+
+
+def is_hashed(stored):
+    return stored.startswith(HASH_SCHEME + '$')
+
+
+def verify_password(password, stored):
+    if not is_hashed(stored):
+        return hmac.compare_digest(password.encode('utf-8'), stored.encode('utf-8'))
+    _, iterations, salt, _ = stored.split('$')
+    return hmac.compare_digest(hash_password(password, int(iterations), salt), stored)
+
+
+class User:
+    def __init__(self, username, password, role):
+        self.username = username
+        self.password = password
+        self.role = role
+
+    def to_dict(self):
+        return {
+            'username': self.username,
+            'password': self.password,
+            'role': self.role
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['username'], data['password'], data['role'])
+
+
+class UserRegistry:
+    def __init__(self, users=(), iterations=DEFAULT_ITERATIONS):
+        self._by_name = {}
+        self.iterations = iterations
+        # True, если при входе пароли открытым текстом заменены хэшами и их нужно сохранить.
+        self.changed = False
+        self._verified = {}
+        self._verify_key = os.urandom(32)
+        for user in users:
+            self._by_name[user.username] = user
+
+    def __iter__(self):
+        return iter(self._by_name.values())
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __contains__(self, username):
+        return username in self._by_name
+
+    def get(self, username):
+        return self._by_name.get(username)
+
+    # Добавление пользователя с паролем password (открытым текстом); None, если имя занято.
+    def register(self, username, password, role):
+        if username in self._by_name:
+            return None
+        user = User(username, hash_password(password, self.iterations), role)
+        self._by_name[username] = user
+        return user
+
+    # Сброс запомненных успешных проверок: следующий вход снова проверяет хэш PBKDF2.
+    def forget_verified(self):
+        self._verified.clear()
+
+    def authenticate(self, username, password):
+        user = self._by_name.get(username)
+        if user is None or password is None:
+            return None
+        token = hmac.new(self._verify_key, password.encode('utf-8'), hashlib.sha256).digest()
+        if self._verified.get(username) == (user.password, token):
+            return user
+        if not verify_password(password, user.password):
+            return None
+        if not is_hashed(user.password):
+            user.password = hash_password(password, self.iterations)
+            self.changed = True
+        self._verified[username] = (user.password, token)
+        return user